@@ -0,0 +1,33 @@
+"""Бенчмарки проекта.
+
+Запускаются из каталога ``yatube/``: ``python -m benchmarks.<модуль>``.
+"""
+import os
+from contextlib import contextmanager
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    import django
+    django.setup()
+
+
+def percentile(values, q):
+    """Перцентиль q (0..100) по отсортированной копии values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+@contextmanager
+def test_database():
+    """Временная база с миграциями на время бенчмарка."""
+    from django.db import connection
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
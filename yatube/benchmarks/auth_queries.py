@@ -0,0 +1,80 @@
+"""SQL-запросы на аутентификацию за запрос: штатные сессии в базе и
+``AuthenticationMiddleware`` против кэшированных сессий и пользователя.
+
+Считаются только запросы к ``django_session`` и ``auth_user`` на
+повторных запросах залогиненного клиента.
+
+    python -m benchmarks.auth_queries --requests 200
+"""
+import argparse
+
+from benchmarks import setup_django, test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+TABLES = ('django_session', 'auth_user')
+
+
+def stock_middleware():
+    middleware = [
+        name for name in settings.MIDDLEWARE
+        if name != 'core.middleware.SessionActivityMiddleware'
+    ]
+    index = middleware.index('core.middleware.CachedAuthenticationMiddleware')
+    middleware[index] = (
+        'django.contrib.auth.middleware.AuthenticationMiddleware')
+    return middleware
+
+
+def measure(user, url, requests):
+    cache.clear()
+    client = Client()
+    client.force_login(user)
+    client.get(url)
+    total = auth = 0
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        total += len(context.captured_queries)
+        auth += sum(
+            any(table in query['sql'] for table in TABLES)
+            for query in context.captured_queries
+        )
+    return total / requests, auth / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+    variants = {
+        'stock': {
+            'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+            'MIDDLEWARE': stock_middleware(),
+        },
+        # как при общем кэше: LocMem в одном процессе
+        'cached': {'CACHE_SINGLE_PROCESS': True},
+    }
+    results = {}
+    with override_settings(DEBUG=False), test_database():
+        user = get_user_model().objects.create_user(username='bench')
+        url = reverse('posts:follow_index')
+        for name, overrides in variants.items():
+            with override_settings(**overrides):
+                results[name] = measure(user, url, args.requests)
+    for name, (total, auth) in results.items():
+        print(f'{name:8} queries={total:.2f} auth={auth:.2f}')
+    removed = results['stock'][0] - results['cached'][0]
+    print(f'Снято запросов на запрос: {removed:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Отрисовка горячих страниц ленты: шаблоны Django против Jinja2.
+
+Оба движка в production-режиме: cached.Loader у Django и Jinja2 без
+auto_reload. Кэш сбрасывается перед каждой отрисовкой, поэтому
+карточки постов каждый раз рисуются заново; счётчик непрочитанного в
+шапке кладётся в кэш заново, чтобы мерить шаблоны, а не его пересчёт.
+Пользователь сохраняется во временной базе.
+
+    python -m benchmarks.jinja2_templates --posts 10 --rounds 500
+"""
+import argparse
+import time
+
+from benchmarks import percentile, setup_django, test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.core.paginator import Paginator  # noqa: E402
+from django.template.loader import get_template  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+from django.urls import resolve, reverse  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from posts.models import Group, Post  # noqa: E402
+from posts.unread import unread_key  # noqa: E402
+
+DJANGO_TEMPLATES = {
+    **settings.TEMPLATES[-1],
+    'OPTIONS': {
+        **settings.TEMPLATES[-1]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader',
+             settings.TEMPLATES_LOADERS),
+        ],
+    },
+}
+JINJA2_TEMPLATES = {
+    **settings.JINJA2_TEMPLATES,
+    'OPTIONS': {**settings.JINJA2_TEMPLATES['OPTIONS'], 'auto_reload': False},
+}
+ENGINES = {
+    'django': [DJANGO_TEMPLATES],
+    'jinja2': [JINJA2_TEMPLATES, DJANGO_TEMPLATES],
+}
+
+
+def make_pages(count):
+    author = get_user_model().objects.create(
+        username='bench', first_name='Имя', last_name='Фамилия')
+    group = Group(pk=1, title='Группа', slug='group', description='')
+    posts = [
+        Post(pk=i, text=f'Пост {i}', author=author, group=group,
+             pub_date=timezone.now())
+        for i in range(1, count + 1)
+    ]
+    page_obj = Paginator(posts, count).get_page(1)
+    return author, {
+        'posts/index.html': (
+            reverse('posts:index'), {'page_obj': page_obj}),
+        'posts/group_list.html': (
+            reverse('posts:group_post', args=(group.slug,)),
+            {'page_obj': page_obj, 'group': group}),
+        'posts/profile.html': (
+            reverse('posts:profile', args=(author.username,)),
+            {'page_obj': page_obj, 'author': author, 'following': False}),
+    }
+
+
+def measure(name, url, context, user, rounds):
+    request = RequestFactory().get(url)
+    request.user = user
+    request.resolver_match = resolve(url)
+    template = get_template(name)
+    timings = []
+    for _ in range(rounds):
+        cache.clear()
+        cache.set(unread_key(user.pk), 0)
+        start = time.perf_counter()
+        template.render(context, request)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=10)
+    parser.add_argument('--rounds', type=int, default=500)
+    args = parser.parse_args()
+    results = {}
+    with test_database():
+        user, pages = make_pages(args.posts)
+        for engine, templates in ENGINES.items():
+            with override_settings(TEMPLATES=templates, DEBUG=False):
+                for name, (url, context) in pages.items():
+                    timings = measure(name, url, context, user, args.rounds)
+                    results[engine, name] = percentile(timings, 50)
+    for name in pages:
+        django_time = results['django', name]
+        jinja_time = results['jinja2', name]
+        print(
+            f'{name:22} django p50={django_time * 1000:.3f}ms '
+            f'jinja2 p50={jinja_time * 1000:.3f}ms '
+            f'x{django_time / jinja_time:.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Накладные расходы MetricsMiddleware на запрос к ленте.
+
+    python -m benchmarks.metrics_overhead --requests 500
+"""
+import argparse
+import time
+
+from benchmarks import percentile, setup_django, test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+
+from posts.models import Post  # noqa: E402
+
+METRICS_MIDDLEWARE = 'core.middleware.MetricsMiddleware'
+ROUNDS = 10
+
+
+def measure(url, requests):
+    client = Client()
+    timings = []
+    for _ in range(requests):
+        cache.clear()
+        start = time.perf_counter()
+        client.get(url)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+    without = [
+        name for name in settings.MIDDLEWARE if name != METRICS_MIDDLEWARE
+    ]
+    with override_settings(DEBUG=False), test_database():
+        author = get_user_model().objects.create_user(username='bench')
+        Post.objects.bulk_create(
+            Post(author=author, text=f'Пост {i}') for i in range(50))
+        configs = {'without': without, 'with': settings.MIDDLEWARE}
+        results = {name: [] for name in configs}
+        # чередуем конфигурации, чтобы прогрев и шум делились поровну
+        for _ in range(ROUNDS):
+            for name, middleware in configs.items():
+                with override_settings(MIDDLEWARE=middleware):
+                    results[name] += measure('/', args.requests // ROUNDS)
+    for name, timings in results.items():
+        print(
+            f'{name:8} p50={percentile(timings, 50) * 1000:7.3f}ms '
+            f'p99={percentile(timings, 99) * 1000:7.3f}ms'
+        )
+    overhead = percentile(results['with'], 50) - percentile(
+        results['without'], 50)
+    print(f'overhead p50={overhead * 1e6:.0f}us per request')
+
+
+if __name__ == '__main__':
+    main()
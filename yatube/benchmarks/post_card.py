@@ -0,0 +1,105 @@
+"""Стоимость отрисовки карточек страницы: ``{% include %}`` без кэша
+шаблонов против ``render_cards`` (тег ``post_cards`` лент) с пустым и
+с заполненным кэшем карточек.
+
+    python -m benchmarks.post_card --posts 10 --rounds 2000
+"""
+import argparse
+import time
+
+from benchmarks import percentile, setup_django
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.template import Context, Engine  # noqa: E402
+from django.template.backends.django import (  # noqa: E402
+    get_installed_libraries,
+)
+from django.test import override_settings  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from posts.cards import render_cards  # noqa: E402
+from posts.models import Group, Post  # noqa: E402
+
+# шаблоны Django как в production: с cached.Loader
+PRODUCTION_TEMPLATES = [{
+    **settings.TEMPLATES[-1],
+    'OPTIONS': {
+        **settings.TEMPLATES[-1]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader',
+             settings.TEMPLATES_LOADERS),
+        ],
+    },
+}]
+INCLUDE = (
+    "{% for post in posts %}{% include 'includes/post_article.html' "
+    "with show_group=True %}{% endfor %}"
+)
+
+
+def make_posts(count):
+    author = get_user_model()(
+        pk=1, username='bench', first_name='Имя', last_name='Фамилия')
+    group = Group(pk=1, title='Группа', slug='group')
+    return [
+        Post(pk=i, text=f'Пост {i}', author=author, group=group,
+             pub_date=timezone.now())
+        for i in range(1, count + 1)
+    ]
+
+
+def measure_include(posts, rounds):
+    engine = Engine(
+        dirs=settings.TEMPLATES[-1]['DIRS'],
+        loaders=[
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ],
+        libraries=get_installed_libraries(),
+    )
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        engine.from_string(INCLUDE).render(Context({'posts': posts}))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def measure_cards(posts, rounds, warm):
+    timings = []
+    for _ in range(rounds):
+        if not warm:
+            cache.clear()
+        start = time.perf_counter()
+        render_cards(posts, show_group=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=10)
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+    posts = make_posts(args.posts)
+    variants = {
+        'include': lambda: measure_include(posts, args.rounds),
+        'miss': lambda: measure_cards(posts, args.rounds, warm=False),
+        'hit': lambda: measure_cards(posts, args.rounds, warm=True),
+    }
+    with override_settings(DEBUG=False, TEMPLATES=PRODUCTION_TEMPLATES):
+        for name, measure in variants.items():
+            timings = measure()
+            per_post = percentile(timings, 50) / args.posts * 1e6
+            print(
+                f'{name:10} page p50={percentile(timings, 50) * 1000:.3f}ms '
+                f'per post={per_post:.1f}us'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Накладные расходы ограничителя частоты на один запрос.
+
+Один и тот же пустой view с декоратором ``ratelimit`` и без него, кэш
+из настроек (по умолчанию locmem). Лимиты подняты, чтобы запросы не
+отклонялись и измерялся именно путь проверки.
+
+    python -m benchmarks.ratelimit --rounds 20000
+"""
+import argparse
+import time
+
+from benchmarks import percentile, setup_django
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+
+from core.ratelimit import ratelimit  # noqa: E402
+
+LIMITS = {'bench': {'user': (10 ** 9, 60), 'ip': (10 ** 9, 60)}}
+
+
+def view(request):
+    return HttpResponse()
+
+
+def measure(handler, request, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        handler(request)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=20000)
+    args = parser.parse_args()
+    request = RequestFactory().post('/')
+    request.user = get_user_model()(pk=1, username='bench')
+    variants = {'plain': view, 'ratelimit': ratelimit('bench')(view)}
+    with override_settings(RATELIMITS=LIMITS, RATELIMIT_ENABLED=True):
+        results = {
+            name: percentile(measure(handler, request, args.rounds), 50)
+            for name, handler in variants.items()
+        }
+    for name, value in results.items():
+        print(f'{name:10} p50={value * 1e6:.1f}us')
+    overhead = results['ratelimit'] - results['plain']
+    print(f'overhead   {overhead * 1e6:.1f}us per request')
+
+
+if __name__ == '__main__':
+    main()
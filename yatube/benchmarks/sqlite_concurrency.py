@@ -0,0 +1,127 @@
+"""Конкурентное чтение и запись в SQLite: штатный бэкенд против
+``core.db.backends.sqlite3``.
+
+Каждая операция имитирует HTTP-запрос: соединение берётся из
+``ConnectionHandler`` и в начале и в конце проверяется так же, как это
+делают сигналы ``request_started``/``request_finished``. Штатная
+конфигурация закрывает соединение после каждого запроса, настроенная -
+переиспользует его.
+
+    python -m benchmarks.sqlite_concurrency --writers 4 --readers 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks import percentile, setup_django
+
+setup_django()
+
+from django.db import OperationalError  # noqa: E402
+from django.db.utils import ConnectionHandler  # noqa: E402
+
+ALIAS = 'default'
+ROWS = 10000
+CONFIGS = {
+    'stock': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'CONN_MAX_AGE': 0,
+    },
+    'tuned': {
+        'ENGINE': 'core.db.backends.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    },
+}
+
+
+def prepare(handler):
+    connection = handler[ALIAS]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'CREATE TABLE item (id INTEGER PRIMARY KEY, payload TEXT)')
+        cursor.executemany(
+            'INSERT INTO item (payload) VALUES (%s)',
+            [('x' * 200,) for _ in range(ROWS)],
+        )
+    connection.close()
+
+
+def worker(handler, write, deadline, stats):
+    rnd = random.Random()
+    latencies = []
+    errors = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        connection = handler[ALIAS]
+        connection.close_if_unusable_or_obsolete()
+        try:
+            with connection.cursor() as cursor:
+                if write:
+                    cursor.execute(
+                        'INSERT INTO item (payload) VALUES (%s)',
+                        ['y' * 200],
+                    )
+                else:
+                    low = rnd.randrange(ROWS)
+                    cursor.execute(
+                        'SELECT id, payload FROM item '
+                        'WHERE id BETWEEN %s AND %s',
+                        [low, low + 10],
+                    )
+                    cursor.fetchall()
+        except OperationalError:
+            errors += 1
+        connection.close_if_unusable_or_obsolete()
+        latencies.append(time.perf_counter() - start)
+    handler[ALIAS].close()
+    stats.append((write, latencies, errors))
+
+
+def run(name, writers, readers, duration):
+    directory = tempfile.mkdtemp()
+    handler = ConnectionHandler({
+        ALIAS: {**CONFIGS[name], 'NAME': os.path.join(directory, 'b.db')},
+    })
+    prepare(handler)
+    stats = []
+    deadline = time.perf_counter() + duration
+    threads = [
+        threading.Thread(
+            target=worker, args=(handler, is_writer, deadline, stats))
+        for is_writer in [True] * writers + [False] * readers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for kind, write in (('write', True), ('read', False)):
+        latencies = [
+            value for is_writer, values, _ in stats if is_writer == write
+            for value in values
+        ]
+        errors = sum(err for is_writer, _, err in stats if is_writer == write)
+        print(
+            f'{name:6} {kind:5} '
+            f'ops/s={len(latencies) / duration:9.0f} '
+            f'p50={percentile(latencies, 50) * 1000:7.2f}ms '
+            f'p99={percentile(latencies, 99) * 1000:7.2f}ms '
+            f'locked={errors}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0)
+    args = parser.parse_args()
+    for name in CONFIGS:
+        run(name, args.writers, args.readers, args.duration)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""Задержка, SQL и аллокации горячих страниц с контролем регрессий.
+
+Работает с базой из настроек (её заранее заполняет ``seed_load``) или,
+с ``--seed``, со временной базой, которую заполняет сам.
+
+    python -m benchmarks.views --output results.json
+    python -m benchmarks.views --baseline baseline.json \\
+        --threshold 0.15 --metric-threshold queries=0
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+from benchmarks import percentile, setup_django, test_database
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from posts.models import Group, Post  # noqa: E402
+
+User = get_user_model()
+
+# метрики, где рост - это регрессия
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'queries', 'alloc_kb')
+ALLOC_REQUESTS = 20
+
+
+def targets():
+    """URL горячих страниц на самых нагруженных объектах базы."""
+    group = Group.objects.annotate(
+        total=Count('posts')).order_by('-total').first()
+    author = User.objects.annotate(
+        total=Count('posts')).order_by('-total').first()
+    post = Post.objects.annotate(
+        total=Count('comments')).order_by('-total').first()
+    reader = User.objects.annotate(
+        total=Count('follower')).order_by('-total').first()
+    if not (group and author and post and reader):
+        sys.exit('База пуста: заполните её командой seed_load или --seed')
+    return reader, {
+        'posts:index': reverse('posts:index'),
+        'posts:group_post': reverse('posts:group_post', args=(group.slug,)),
+        'posts:profile': reverse('posts:profile', args=(author.username,)),
+        'posts:post_detail': reverse('posts:post_detail', args=(post.pk,)),
+        'posts:follow_index': reverse('posts:follow_index'),
+    }
+
+
+def measure(client, url, requests, warmup, warm_cache):
+    for _ in range(warmup):
+        client.get(url)
+    timings = []
+    queries = 0
+    for _ in range(requests):
+        if not warm_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            client.get(url)
+            timings.append(time.perf_counter() - start)
+        queries += len(context.captured_queries)
+    # отдельный проход: tracemalloc заметно замедляет запросы
+    peaks = []
+    for _ in range(ALLOC_REQUESTS):
+        if not warm_cache:
+            cache.clear()
+        tracemalloc.start()
+        client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+    return {
+        'p50_ms': round(percentile(timings, 50) * 1000, 3),
+        'p95_ms': round(percentile(timings, 95) * 1000, 3),
+        'p99_ms': round(percentile(timings, 99) * 1000, 3),
+        'queries': round(queries / requests, 2),
+        'alloc_kb': round(percentile(peaks, 50) / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold, overrides):
+    """Список регрессий относительно baseline."""
+    regressions = []
+    for view, metrics in results.items():
+        for metric, base in baseline.get(view, {}).items():
+            if metric not in METRICS or metric not in metrics:
+                continue
+            limit = base * (1 + overrides.get(metric, threshold))
+            if metrics[metric] > limit:
+                regressions.append(
+                    f'{view} {metric}: {metrics[metric]} > {limit:.3f} '
+                    f'(baseline {base})'
+                )
+    return regressions
+
+
+def parse_overrides(values):
+    overrides = {}
+    for value in values:
+        metric, _, fraction = value.partition('=')
+        if metric not in METRICS:
+            raise argparse.ArgumentTypeError(f'Неизвестная метрика {metric}')
+        overrides[metric] = float(fraction)
+    return overrides
+
+
+def run(args):
+    reader, urls = targets()
+    client = Client()
+    client.force_login(reader)
+    results = {}
+    for view, url in urls.items():
+        results[view] = measure(
+            client, url, args.requests, args.warmup, args.warm_cache)
+        print(f'{view:20} ' + ' '.join(
+            f'{metric}={value}' for metric, value in results[view].items()))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument(
+        '--warm-cache', action='store_true',
+        help='Не сбрасывать кэш перед каждым запросом.')
+    parser.add_argument(
+        '--seed', action='store_true',
+        help='Временная база, заполненная seed_load.')
+    parser.add_argument(
+        '--seed-options', default='--users 2000 --posts 50000 '
+        '--comments 50000 --follows 20000',
+        help='Аргументы seed_load для --seed.')
+    parser.add_argument('--output', help='Куда записать результаты JSON.')
+    parser.add_argument('--baseline', help='JSON с эталонными результатами.')
+    parser.add_argument(
+        '--threshold', type=float, default=0.10,
+        help='Допустимый рост метрики, доля от эталона.')
+    parser.add_argument(
+        '--metric-threshold', action='append', default=[],
+        metavar='METRIC=FRACTION',
+        help='Свой порог для метрики, например queries=0.')
+    args = parser.parse_args()
+    overrides = parse_overrides(args.metric_threshold)
+
+    database = test_database() if args.seed else nullcontext()
+    with override_settings(DEBUG=False), database:
+        if args.seed:
+            call_command('seed_load', *args.seed_options.split())
+        results = run(args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({
+                'meta': {
+                    'python': platform.python_version(),
+                    'requests': args.requests,
+                    'warm_cache': args.warm_cache,
+                },
+                'views': results,
+            }, file, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)['views']
+        regressions = compare(results, baseline, args.threshold, overrides)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+        print('Регрессий нет')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Пользователь запроса из кэша вместо запроса к ``auth_user``.
+
+Объект ``User`` кэшируется по id и удаляется из кэша при любом
+сохранении или удалении пользователя (смена пароля, правка профиля,
+отметка входа). Проверка хэша сессии та же, что в ``auth.get_user``:
+после смены пароля старые сессии сбрасываются.
+
+Сброс работает, только если кэш общий для всех воркеров: с LocMem
+остальные воркеры ещё ``AUTH_USER_CACHE_TIMEOUT`` секунд пускали бы по
+старой сессии, поэтому с ним пользователь читается из базы, как у
+штатного ``auth.get_user``. ``QuerySet.update()`` сигналов не шлёт -
+после него нужен ``invalidate_user``.
+"""
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.utils.crypto import constant_time_compare
+
+from .cache import is_shared
+
+
+def user_key(user_id):
+    return f'auth_user:{user_id}'
+
+
+def invalidate_user(user_id):
+    cache.delete(user_key(user_id))
+
+
+def get_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = load_user(request)
+    return request._cached_user
+
+
+def load_user(request):
+    if not is_shared(DEFAULT_CACHE_ALIAS):
+        return auth.get_user(request)
+    try:
+        user_id = auth._get_user_session_key(request)
+        backend_path = request.session[auth.BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+    user = cache.get(user_key(user_id))
+    if user is None:
+        user = auth.load_backend(backend_path).get_user(user_id)
+        if user is None:
+            return AnonymousUser()
+        cache.set(user_key(user_id), user, settings.AUTH_USER_CACHE_TIMEOUT)
+    session_hash = request.session.get(auth.HASH_SESSION_KEY)
+    if not (session_hash and constant_time_compare(
+            session_hash, user.get_session_auth_hash())):
+        request.session.flush()
+        return AnonymousUser()
+    user.backend = backend_path
+    return user
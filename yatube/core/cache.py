@@ -0,0 +1,49 @@
+"""Кэш-бэкенды, которые считают попадания и промахи для метрик."""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends import dummy, locmem
+
+from . import metrics
+
+_MISSING = object()
+
+
+class MetricsCacheMixin:
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        stats = metrics.current()
+        if stats is not None:
+            if value is _MISSING:
+                stats.cache_misses += 1
+            else:
+                stats.cache_hits += 1
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        stats = metrics.current()
+        if stats is None:
+            return super().get_many(keys, version=version)
+        # базовый get_many может ходить через get: его счёт заменяем
+        hits, misses = stats.cache_hits, stats.cache_misses
+        found = super().get_many(keys, version=version)
+        stats.cache_hits = hits + len(found)
+        stats.cache_misses = misses + len(keys) - len(found)
+        return found
+
+
+class LocMemCache(MetricsCacheMixin, locmem.LocMemCache):
+    pass
+
+
+def is_shared(alias):
+    """Видят ли записи и удаления в кэше alias все процессы сайта.
+
+    LocMem живёт в памяти процесса: удаление записи в одном воркере не
+    видно остальным. ``CACHE_SINGLE_PROCESS`` говорит, что процесс один
+    (runserver, тесты) и такой кэш тоже общий.
+    """
+    if settings.CACHE_SINGLE_PROCESS:
+        return True
+    local = (locmem.LocMemCache, dummy.DummyCache)
+    return not isinstance(caches[alias], local)
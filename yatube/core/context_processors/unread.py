@@ -0,0 +1,16 @@
+from django.utils.functional import SimpleLazyObject
+
+from posts.unread import get_unread
+
+
+def unread(request):
+    """Число непрочитанных постов ленты подписок для шапки.
+
+    Ленивое: кэш читается, только если шаблон выводит переменную.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {
+        'unread_count': SimpleLazyObject(lambda: get_unread(user.pk)),
+    }
@@ -0,0 +1,71 @@
+"""SQLite-бэкенд с настройками для боевого режима.
+
+При каждом новом соединении включаются WAL-журнал и PRAGMA из
+``DEFAULT_PRAGMAS``, которые можно переопределить через
+``OPTIONS['pragmas']``. Постоянные соединения (``CONN_MAX_AGE``)
+перед первым использованием в запросе проверяются на живость, если в
+настройках базы указан ``CONN_HEALTH_CHECKS``.
+"""
+from django.db.backends.sqlite3 import base
+
+Database = base.Database
+
+DEFAULT_PRAGMAS = {
+    # читатели не блокируют писателя и наоборот
+    'journal_mode': 'WAL',
+    # в режиме WAL fsync только на checkpoint, без потери целостности
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # отрицательное значение - размер в килобайтах
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_enabled = self.settings_dict.get(
+            'CONN_HEALTH_CHECKS', False)
+        self.health_check_done = False
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = {**DEFAULT_PRAGMAS, **kwargs.pop('pragmas', {})}
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def is_usable(self):
+        try:
+            self.connection.execute('SELECT 1')
+        except Database.Error:
+            return False
+        return True
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        # соединение переживает запрос - проверим его при следующем
+        # обращении
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        if (
+            self.connection is not None
+            and self.health_check_enabled
+            and not self.health_check_done
+            and not self.in_atomic_block
+        ):
+            if not self.is_usable():
+                self.close()
+            self.health_check_done = True
+        super().ensure_connection()
@@ -0,0 +1,59 @@
+"""Маршрутизация чтения лент на реплики.
+
+Чтения уходят на реплику, только если ``ReplicaRoutingMiddleware``
+включил это для текущего запроса (см. ``REPLICA_READ_VIEWS``) и клиент не
+закреплён за основной базой после недавней записи.
+"""
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_state = threading.local()
+
+
+def begin(pinned=False):
+    _state.use_replica = False
+    _state.pinned = pinned
+    _state.wrote = False
+
+
+def use_replica():
+    _state.use_replica = True
+
+
+def end():
+    """Сбрасывает состояние запроса, возвращает True, если была запись."""
+    wrote = getattr(_state, 'wrote', False)
+    begin()
+    return wrote
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            replicas
+            and getattr(_state, 'use_replica', False)
+            and not _state.pinned
+        ):
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        # всё, что прочитано после записи, должно её видеть
+        _state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,101 @@
+"""Журнал медленных SQL-запросов с привязкой к view и шаблону.
+
+Каждая запись - строка JSON в логгере ``yatube.slow_queries``; сводку по
+журналу строит команда ``slow_query_report``.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+from django.conf import settings
+from django.template import base as template_base
+
+logger = logging.getLogger('yatube.slow_queries')
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_SPACES = re.compile(r'\s+')
+
+# кадры самого журнала и инструментирующих обёрток неинтересны
+_CORE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SKIP = (
+    os.path.join(_CORE_DIR, 'db', ''),
+    os.path.join(_CORE_DIR, 'middleware.py'),
+    os.path.join(_CORE_DIR, 'template.py'),
+)
+
+
+def normalize(sql):
+    """SQL без литералов: запросы, отличающиеся значениями, совпадают."""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+def fingerprint(params):
+    return hashlib.sha1(repr(params).encode()).hexdigest()[:12]
+
+
+def find_origin():
+    """Шаблон и строка кода проекта, из которых пришёл запрос."""
+    template = None
+    frame_info = None
+    render_code = template_base.Node.render_annotated.__code__
+    frame = sys._getframe(1)
+    while frame is not None:
+        if template is None and frame.f_code is render_code:
+            node = frame.f_locals.get('self')
+            origin = getattr(node, 'origin', None)
+            token = getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                name = origin.template_name or origin.name
+                template = f'{name}:{token.lineno}'
+        filename = frame.f_code.co_filename
+        if (
+            frame_info is None
+            and filename.startswith(settings.BASE_DIR)
+            and not filename.startswith(_SKIP)
+        ):
+            frame_info = (
+                f'{os.path.relpath(filename, settings.BASE_DIR)}:'
+                f'{frame.f_lineno} in {frame.f_code.co_name}'
+            )
+        if template is not None and frame_info is not None:
+            break
+        frame = frame.f_back
+    return template, frame_info
+
+
+class SlowQueryLogger:
+    """Обёртка для ``connection.execute_wrapper``."""
+    def __init__(self, view, threshold_ms):
+        self.view = view
+        self.threshold = threshold_ms / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            if duration >= self.threshold:
+                self.log(sql, params, duration)
+
+    def log(self, sql, params, duration):
+        template, frame = find_origin()
+        logger.warning(json.dumps({
+            'sql': normalize(sql),
+            'params': fingerprint(params),
+            'duration_ms': round(duration * 1000, 3),
+            'view': self.view(),
+            'template': template,
+            'frame': frame,
+        }, ensure_ascii=False))
@@ -0,0 +1,93 @@
+"""Окружение Jinja2 для горячих шаблонов ленты.
+
+Повторяет то, что шаблоны Django берут из тегов и фильтров: ``url``,
+``static``, ``thumbnail``, ``{% cache %}``, ``date`` и ``addclass``.
+"""
+import logging
+
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.template.defaultfilters import date as date_filter
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.timezone import template_localtime
+from jinja2 import Environment, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+from sorl.thumbnail import get_thumbnail
+from sorl.thumbnail.conf import settings as thumbnail_settings
+
+from posts.cards import render_cards
+from posts.follow_graph import get_suggested_authors
+
+logger = logging.getLogger('sorl.thumbnail')
+
+
+def url(name, *args, **kwargs):
+    return reverse(name, args=args, kwargs=kwargs)
+
+
+def thumbnail(file_, geometry, **options):
+    """Миниатюра или None, как ветка ``{% empty %}`` у тега sorl."""
+    if not file_:
+        return None
+    try:
+        return get_thumbnail(file_, geometry, **options)
+    except Exception:
+        if thumbnail_settings.THUMBNAIL_DEBUG:
+            raise
+        logger.exception('Не удалось сделать миниатюру %s', file_)
+        return None
+
+
+def date(value, arg=None):
+    return date_filter(template_localtime(value), arg)
+
+
+def addclass(field, css):
+    return field.as_widget(attrs={'class': css})
+
+
+class FragmentCacheExtension(Extension):
+    """``{% cache 20, 'index_page', page_obj.number %}...{% endcache %}``.
+
+    Ключ тот же, что у тега ``cache`` Django.
+    """
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        timeout = parser.parse_expression()
+        parser.stream.expect('comma')
+        name = parser.parse_expression()
+        vary_on = []
+        while parser.stream.skip_if('comma'):
+            vary_on.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        call = self.call_method(
+            '_cache', [timeout, name, nodes.List(vary_on)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _cache(self, timeout, name, vary_on, caller):
+        key = make_template_fragment_key(name, vary_on)
+        value = cache.get(key)
+        if value is None:
+            value = str(caller())
+            cache.set(key, value, timeout)
+        return Markup(value)
+
+
+def environment(**options):
+    env = Environment(extensions=[FragmentCacheExtension], **options)
+    env.globals.update({
+        'url': url,
+        'static': static,
+        'thumbnail': thumbnail,
+        'post_cards': render_cards,
+        'suggested_authors': get_suggested_authors,
+    })
+    env.filters.update({
+        'date': date,
+        'addclass': addclass,
+    })
+    return env
@@ -0,0 +1,36 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Обновляет SQLite-реплики копией основной базы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять каждые N секунд; 0 - обновить один раз.',
+        )
+
+    def handle(self, *args, interval, **options):
+        while True:
+            for alias in settings.DATABASE_REPLICAS:
+                self.refresh(alias)
+            if not interval:
+                break
+            time.sleep(interval)
+
+    def refresh(self, alias):
+        source = connections[DEFAULT_DB_ALIAS]
+        source.ensure_connection()
+        target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+        try:
+            # backup копирует страницы на месте, поэтому открытые
+            # соединения реплики сразу видят новые данные
+            source.connection.backup(target)
+        finally:
+            target.close()
+        self.stdout.write(f'{alias}: обновлена')
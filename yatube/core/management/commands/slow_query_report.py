@@ -0,0 +1,43 @@
+import json
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SORT_KEYS = ('total', 'count', 'max')
+
+
+class Command(BaseCommand):
+    help = 'Топ медленных запросов из журнала SLOW_QUERY_LOG.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', default=settings.SLOW_QUERY_LOG)
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument('--sort', choices=SORT_KEYS, default='total')
+
+    def handle(self, *args, log, top, sort, **options):
+        try:
+            with open(log, encoding='utf-8') as file:
+                entries = [json.loads(line) for line in file if line.strip()]
+        except FileNotFoundError:
+            raise CommandError(f'Журнал {log} не найден')
+        groups = defaultdict(lambda: {
+            'count': 0, 'total': 0.0, 'max': 0.0,
+            'views': Counter(), 'origins': Counter(),
+        })
+        for entry in entries:
+            group = groups[entry['sql']]
+            group['count'] += 1
+            group['total'] += entry['duration_ms']
+            group['max'] = max(group['max'], entry['duration_ms'])
+            group['views'][entry['view']] += 1
+            group['origins'][entry['template'] or entry['frame']] += 1
+        ranked = sorted(
+            groups.items(), key=lambda item: item[1][sort], reverse=True)
+        for sql, group in ranked[:top]:
+            view, _ = group['views'].most_common(1)[0]
+            origin, _ = group['origins'].most_common(1)[0]
+            self.stdout.write(
+                f"{group['total']:10.1f}ms total  {group['count']:6} calls  "
+                f"{group['max']:8.1f}ms max  {view}  {origin}\n    {sql}"
+            )
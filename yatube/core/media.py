@@ -0,0 +1,138 @@
+"""Отдача загруженных файлов.
+
+После проверки доступа файл отдаёт фронт-сервер: nginx по
+``X-Accel-Redirect`` или Apache/lighttpd по ``X-Sendfile`` (настройка
+``MEDIA_ACCEL``). Без фронт-сервера - ``FileResponse``, который WSGI-
+сервер с ``wsgi.file_wrapper`` отдаёт через sendfile, с ETag, 304 и
+одиночными диапазонами Range.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date
+
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def check_access(request, path):
+    """Открыты только каталоги из MEDIA_PUBLIC_PREFIXES, без скрытых
+    файлов."""
+    if any(part.startswith('.') for part in path.split('/')):
+        return False
+    return path.startswith(tuple(settings.MEDIA_PUBLIC_PREFIXES))
+
+
+def make_etag(stat):
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(header, size):
+    """(start, end) включительно, None без диапазона или ValueError,
+    если диапазон за пределами файла. Несколько диапазонов не
+    поддерживаются - файл отдаётся целиком."""
+    match = RANGE.match(header.replace(' ', ''))
+    if not match or not any(match.groups()):
+        return None
+    start, end = match.groups()
+    if not start:
+        length = int(end)
+        if not length:
+            raise ValueError
+        return max(0, size - length), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError
+    return start, end
+
+
+def read_range(file, start, length):
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def accel_response(path, fullpath):
+    response = HttpResponse()
+    if settings.MEDIA_ACCEL == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = quote(
+            settings.MEDIA_ACCEL_PREFIX + path)
+    else:
+        response['X-Sendfile'] = fullpath
+    # тип и длину выставит фронт-сервер
+    del response['Content-Type']
+    return response
+
+
+def find_file(request, path):
+    if not check_access(request, path):
+        raise Http404('Файл не найден')
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Файл не найден')
+    if not os.path.isfile(fullpath):
+        raise Http404('Файл не найден')
+    return fullpath
+
+
+def file_response(request, fullpath):
+    stat = os.stat(fullpath)
+    etag = make_etag(stat)
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    content_type, _ = mimetypes.guess_type(fullpath)
+    content_type = content_type or 'application/octet-stream'
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if 'HTTP_RANGE' in request.META and if_range in (None, etag):
+        try:
+            byte_range = parse_range(request.META['HTTP_RANGE'], stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+    if byte_range is None:
+        response = FileResponse(
+            open(fullpath, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            read_range(open(fullpath, 'rb'), start, length),
+            status=206, content_type=content_type)
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = f'public, max-age={settings.MEDIA_MAX_AGE}'
+    return response
+
+
+def serve(request, path):
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = find_file(request, path)
+    if settings.MEDIA_ACCEL:
+        return accel_response(path, fullpath)
+    return file_response(request, fullpath)
@@ -0,0 +1,141 @@
+"""Метрики запросов в текстовом формате Prometheus.
+
+Хранятся в памяти процесса: каждый воркер отдаёт на ``/metrics`` свои
+значения, суммирует их уже Prometheus.
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+TIME_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5,
+)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_local = threading.local()
+
+
+class RequestStats:
+    """Счётчики одного запроса, их наполняют обёртки БД, шаблонов и кэша."""
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+def start_request():
+    _local.stats = RequestStats()
+    return _local.stats
+
+
+def finish_request():
+    _local.stats = None
+
+
+def current():
+    """Счётчики текущего запроса или None вне запроса."""
+    return getattr(_local, 'stats', None)
+
+
+def _format_labels(labels):
+    return ','.join(f'{name}="{value}"' for name, value in labels)
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets, label):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.label = label
+        self._lock = threading.Lock()
+        self._values = defaultdict(
+            lambda: [[0] * (len(buckets) + 1), 0.0])
+
+    def observe(self, label_value, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values[label_value]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} histogram'
+        with self._lock:
+            values = {
+                key: (list(counts), total)
+                for key, (counts, total) in self._values.items()
+            }
+        for label_value, (counts, total) in sorted(values.items()):
+            labels = ((self.label, label_value),)
+            cumulative = 0
+            bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                bucket_labels = _format_labels(labels + (('le', bound),))
+                yield f'{self.name}_bucket{{{bucket_labels}}} {cumulative}'
+            yield f'{self.name}_sum{{{_format_labels(labels)}}} {total}'
+            yield f'{self.name}_count{{{_format_labels(labels)}}} {cumulative}'
+
+
+class Counter:
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values = defaultdict(int)
+
+    def inc(self, label_values, amount=1):
+        with self._lock:
+            self._values[label_values] += amount
+
+    def collect(self):
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} counter'
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            labels = _format_labels(zip(self.labels, label_values))
+            yield f'{self.name}{{{labels}}} {value}'
+
+
+REQUEST_TIME = Histogram(
+    'yatube_request_duration_seconds',
+    'Время обработки запроса.', TIME_BUCKETS, 'view')
+QUERY_COUNT = Histogram(
+    'yatube_db_queries_per_request',
+    'Число SQL-запросов за запрос.', COUNT_BUCKETS, 'view')
+QUERY_TIME = Histogram(
+    'yatube_db_query_duration_seconds',
+    'Суммарное время SQL-запросов за запрос.', TIME_BUCKETS, 'view')
+TEMPLATE_TIME = Histogram(
+    'yatube_template_render_seconds',
+    'Время отрисовки шаблонов за запрос.', TIME_BUCKETS, 'view')
+CACHE_REQUESTS = Counter(
+    'yatube_cache_requests_total',
+    'Обращения к кэшу по результату.', ('view', 'result'))
+
+REGISTRY = (REQUEST_TIME, QUERY_COUNT, QUERY_TIME, TEMPLATE_TIME,
+            CACHE_REQUESTS)
+
+
+def record(view, duration, stats):
+    REQUEST_TIME.observe(view, duration)
+    QUERY_COUNT.observe(view, stats.queries)
+    QUERY_TIME.observe(view, stats.query_time)
+    TEMPLATE_TIME.observe(view, stats.template_time)
+    if stats.cache_hits:
+        CACHE_REQUESTS.inc((view, 'hit'), stats.cache_hits)
+    if stats.cache_misses:
+        CACHE_REQUESTS.inc((view, 'miss'), stats.cache_misses)
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,122 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.db import connections
+from django.utils.functional import SimpleLazyObject
+
+from . import auth, metrics
+from .cache import is_shared
+from .db import routers
+from .db.slow_queries import SlowQueryLogger
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """Включает чтение с реплик для view из ``REPLICA_READ_VIEWS``.
+
+    После записи клиент получает cookie и ``REPLICA_PIN_SECONDS`` секунд
+    читает из основной базы, чтобы видеть свои изменения.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        cookie = settings.REPLICA_PIN_COOKIE
+        routers.begin(pinned=cookie in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = routers.end()
+        if wrote or request.method not in SAFE_METHODS:
+            response.set_cookie(
+                cookie, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = request.resolver_match.view_name
+        if view_name in settings.REPLICA_READ_VIEWS:
+            routers.use_replica()
+
+
+class MetricsMiddleware:
+    """Собирает время запроса, SQL, шаблонов и кэша по имени URL."""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(self.count_query))
+                response = self.get_response(request)
+        finally:
+            metrics.finish_request()
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        metrics.record(view, time.perf_counter() - start, stats)
+        return response
+
+    @staticmethod
+    def count_query(execute, sql, params, many, context):
+        stats = metrics.current()
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if stats is not None:
+                stats.queries += 1
+                stats.query_time += time.perf_counter() - start
+
+
+class SlowQueryLogMiddleware:
+    """Пишет в журнал запросы дольше ``SLOW_QUERY_THRESHOLD_MS``."""
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        def view():
+            match = getattr(request, 'resolver_match', None)
+            return match.view_name if match else None
+
+        logger = SlowQueryLogger(view, settings.SLOW_QUERY_THRESHOLD_MS)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(logger))
+            return self.get_response(request)
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """``AuthenticationMiddleware`` с пользователем из кэша, см.
+    core/auth.py."""
+    def process_request(self, request):
+        request.user = SimpleLazyObject(lambda: auth.get_user(request))
+
+
+class SessionActivityMiddleware:
+    """Отмечает в сессии время последней активности пользователя.
+
+    Ключ ``last_activity`` входит в ``SESSION_LAZY_KEYS``, поэтому
+    отметка почти всегда пишется только в кэш. Без общего кэша сессии
+    живут в базе, и отметка не ставится: иначе каждую минуту запись и
+    клиент прижат к основной базе, см. core/db/routers.py.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (is_shared(settings.SESSION_CACHE_ALIAS)
+                and request.user.is_authenticated):
+            now = int(time.time())
+            last = request.session.get('last_activity', 0)
+            if now - last >= settings.SESSION_ACTIVITY_RESOLUTION:
+                request.session['last_activity'] = now
+        return self.get_response(request)
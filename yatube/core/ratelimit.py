@@ -0,0 +1,85 @@
+"""Ограничение частоты запросов на атомарных инкрементах кэша.
+
+Скользящее окно из двух счётчиков: текущего и предыдущего периода,
+вклад предыдущего убывает пропорционально прошедшей части текущего.
+На каждый запрос - один ``incr`` и один ``get`` на каждое правило,
+записей в базу нет. Подходит любой бэкенд с атомарным ``incr``
+(locmem, memcached, redis).
+
+Правила - ``RATELIMITS``: для каждой области пара ``(limit, period)``
+на пользователя и на IP.
+"""
+import math
+import time
+from functools import wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import render
+
+
+def rate_cache():
+    return caches[settings.RATELIMIT_CACHE]
+
+
+def idents(request):
+    """Ключи клиента по видам правил."""
+    keys = {'ip': request.META.get('REMOTE_ADDR', '')}
+    if request.user.is_authenticated:
+        keys['user'] = str(request.user.pk)
+    return keys
+
+
+def hit(key, limit, period, now=None):
+    """Засчитывает запрос; 0, если он в лимите, иначе секунды до конца
+    текущего окна."""
+    now = time.time() if now is None else now
+    window, elapsed = divmod(now, period)
+    window = int(window)
+    current_key = f'{key}:{window}'
+    cache = rate_cache()
+    cache.add(current_key, 0, period * 2)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        # ключ истёк между add и incr
+        cache.set(current_key, 1, period * 2)
+        current = 1
+    previous = cache.get(f'{key}:{window - 1}', 0)
+    if previous * (1 - elapsed / period) + current <= limit:
+        return 0
+    return math.ceil(period - elapsed)
+
+
+def check(request, scope, now=None):
+    """0 или секунды, через которые клиенту можно повторить запрос."""
+    rules = settings.RATELIMITS.get(scope, {})
+    retry_after = 0
+    for kind, ident in idents(request).items():
+        if kind not in rules:
+            continue
+        limit, period = rules[kind]
+        retry_after = max(
+            retry_after,
+            hit(f'ratelimit:{scope}:{kind}:{ident}', limit, period, now))
+    return retry_after
+
+
+def ratelimit(scope, methods=('POST',)):
+    """Декоратор view: ограничивает запросы методов ``methods``."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if settings.RATELIMIT_ENABLED and request.method in methods:
+                retry_after = check(request, scope)
+                if retry_after:
+                    response = render(
+                        request, 'core/429.html',
+                        {'retry_after': retry_after},
+                        status=HTTPStatus.TOO_MANY_REQUESTS)
+                    response['Retry-After'] = str(retry_after)
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,68 @@
+"""Сессии в кэше с записью в базу и отложенной записью «ленивых» ключей.
+
+Чтение - из кэша, как у ``cached_db``. Если за запрос изменились только
+ключи из ``SESSION_LAZY_KEYS`` (отметки активности и подобное), сессия
+пишется только в кэш, а в базу - не чаще раза в
+``SESSION_LAZY_WRITE_INTERVAL`` секунд. Потеря кэша откатывает лишь
+эти ключи.
+
+Кэш сессий должен быть общим для всех воркеров: выход или сброс сессии
+в одном из них иначе не виден остальным. С LocMem (см.
+``core.cache.is_shared``) сессии читаются и пишутся только в базу.
+
+    SESSION_ENGINE = 'core.sessions'
+"""
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db, db
+
+from .cache import is_shared
+
+KEY_PREFIX = 'core.sessions'
+# когда сессия последний раз записывалась в базу
+DB_SAVED_AT = '_db_saved_at'
+
+
+class SessionStore(cached_db.SessionStore):
+    cache_key_prefix = KEY_PREFIX
+
+    def load(self):
+        if is_shared(settings.SESSION_CACHE_ALIAS):
+            data = super().load()
+        else:
+            data = db.SessionStore.load(self)
+        self._loaded = dict(data)
+        return data
+
+    def exists(self, session_key):
+        if is_shared(settings.SESSION_CACHE_ALIAS):
+            return super().exists(session_key)
+        return db.SessionStore.exists(self, session_key)
+
+    def changed_keys(self):
+        loaded = getattr(self, '_loaded', {})
+        keys = set(loaded) | set(self._session)
+        return {
+            key for key in keys
+            if loaded.get(key, self) != self._session.get(key, self)
+        }
+
+    def can_defer(self):
+        if not self.session_key or not hasattr(self, '_loaded'):
+            return False
+        if not self.changed_keys() <= set(settings.SESSION_LAZY_KEYS):
+            return False
+        saved_at = self._session.get(DB_SAVED_AT, 0)
+        return time.time() - saved_at < settings.SESSION_LAZY_WRITE_INTERVAL
+
+    def save(self, must_create=False):
+        if not is_shared(settings.SESSION_CACHE_ALIAS):
+            db.SessionStore.save(self, must_create)
+        elif not must_create and self.can_defer():
+            self._cache.set(self.cache_key, self._session,
+                            self.get_expiry_age())
+        else:
+            self._session[DB_SAVED_AT] = int(time.time())
+            super().save(must_create)
+        self._loaded = dict(self._session)
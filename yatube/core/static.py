@@ -0,0 +1,78 @@
+"""Отдача статики без фронт-сервера: готовые сжатые варианты и вечный
+кэш для файлов с хэшем в имени.
+
+Файлы берутся из ``STATIC_ROOT`` (после collectstatic); в DEBUG, если
+файла там нет, - через finders, как ``runserver``.
+"""
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+# name.0123456789ab.css - так называет файлы ManifestStaticFilesStorage
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме запрещённых через q=0."""
+    encodings = set()
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        params = params.replace(' ', '')
+        if params in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        encodings.add(name.strip().lower())
+    return encodings
+
+
+def find_file(path):
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Файл не найден')
+    if os.path.isfile(fullpath):
+        return fullpath
+    if settings.DEBUG:
+        found = finders.find(path)
+        if found:
+            return found
+    raise Http404('Файл не найден')
+
+
+def serve(request, path):
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = find_file(path)
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    encoding = None
+    filename = fullpath
+    for name, suffix in ENCODINGS:
+        if name in accepted and os.path.isfile(fullpath + suffix):
+            encoding, filename = name, fullpath + suffix
+            break
+    stat = os.stat(filename)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'),
+                              stat.st_mtime, stat.st_size):
+        return HttpResponseNotModified()
+    content_type, _ = mimetypes.guess_type(fullpath)
+    response = FileResponse(
+        open(filename, 'rb'),
+        content_type=content_type or 'application/octet-stream')
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Vary'] = 'Accept-Encoding'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    if HASHED_NAME.search(path):
+        response['Cache-Control'] = IMMUTABLE
+    else:
+        response['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,102 @@
+"""Хранилище статики для collectstatic: хэши в именах, минификация CSS
+и JS, готовые gzip- и brotli-варианты рядом с файлами.
+
+brotli ставится из requirements.txt; если его нет, пишется только
+``.gz``, о чём предупреждает проверка ``core.W001``.
+"""
+import gzip
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core import checks
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_EXTENSIONS = (
+    '.css', '.js', '.svg', '.txt', '.html', '.json', '.xml', '.map', '.ico',
+)
+# мелкие файлы сжатие не окупает
+COMPRESS_MIN_SIZE = 256
+
+_CSS_COMMENT = re.compile(r'/\*(?!!).*?\*/', re.S)
+_CSS_SPACES = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON = re.compile(r'\s*:\s+')
+
+
+def minify_css(source):
+    source = _CSS_COMMENT.sub('', source)
+    source = _CSS_SPACES.sub(' ', source)
+    source = _CSS_PUNCTUATION.sub(r'\1', source)
+    source = _CSS_COLON.sub(':', source)
+    return source.replace(';}', '}').strip()
+
+
+def minify_js(source):
+    """Осторожная минификация: без разбора JS убираются только отступы,
+    пустые строки и строки-комментарии."""
+    lines = (line.strip() for line in source.splitlines())
+    return '\n'.join(
+        line for line in lines if line and not line.startswith('//'))
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+@checks.register()
+def check_brotli(app_configs, **kwargs):
+    storage = 'core.storage.CompressedManifestStaticFilesStorage'
+    if brotli is not None or settings.STATICFILES_STORAGE != storage:
+        return []
+    return [checks.Warning(
+        'brotli не установлен: collectstatic запишет только .gz.',
+        hint='pip install -r requirements.txt',
+        id='core.W001',
+    )]
+
+
+def compress(data):
+    """Пары (суффикс, сжатые данные), которые меньше исходника."""
+    variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data)))
+    return [(suffix, packed) for suffix, packed in variants
+            if len(packed) < len(data)]
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def _save(self, name, content):
+        minify = MINIFIERS.get(name[name.rfind('.'):].lower())
+        if minify is not None:
+            source = b''.join(content.chunks()).decode('utf-8')
+            content = ContentFile(minify(source).encode('utf-8'))
+        return super()._save(name, content)
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+                paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            self.write_compressed(hashed_name)
+
+    def write_compressed(self, name):
+        if not name.endswith(COMPRESS_EXTENSIONS):
+            return
+        with self.open(name) as file:
+            data = file.read()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return
+        for suffix, packed in compress(data):
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(packed))
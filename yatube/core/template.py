@@ -0,0 +1,28 @@
+"""Бэкенд шаблонов Django, который замеряет время отрисовки для метрик."""
+import time
+
+from django.template.backends import django
+
+from . import metrics
+
+
+class Template(django.Template):
+    def render(self, context=None, request=None):
+        stats = metrics.current()
+        if stats is None:
+            return super().render(context, request)
+        # render_to_string внутри тегов не должен считаться дважды
+        stats.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_depth -= 1
+            if not stats.template_depth:
+                stats.template_time += time.perf_counter() - start
+
+
+class DjangoTemplates(django.DjangoTemplates):
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return Template(template.template, self)
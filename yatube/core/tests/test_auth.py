@@ -0,0 +1,133 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core import auth
+from core.sessions import DB_SAVED_AT, SessionStore
+
+User = get_user_model()
+
+
+@override_settings(CACHE_SINGLE_PROCESS=True)
+class CachedAuthTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='TestUser', password='old-password')
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:post_create')
+
+    def get_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url)
+        return [query['sql'] for query in context.captured_queries]
+
+    def test_repeat_request_skips_session_and_user(self):
+        """Повторный запрос не читает ни сессию, ни пользователя из базы."""
+        self.client.get(self.url)
+        queries = self.get_queries()
+        for table in ('django_session', 'auth_user'):
+            with self.subTest(table=table):
+                self.assertFalse(any(table in sql for sql in queries))
+
+    def test_profile_edit_invalidates_user(self):
+        """Правка пользователя сбрасывает его копию в кэше."""
+        self.client.get(self.url)
+        self.assertIsNotNone(cache.get(auth.user_key(self.user.pk)))
+        self.user.first_name = 'Новое'
+        self.user.save()
+        self.assertIsNone(cache.get(auth.user_key(self.user.pk)))
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['user'].first_name, 'Новое')
+
+    def test_password_change_logs_out(self):
+        """После смены пароля старые сессии перестают действовать."""
+        self.client.get(self.url)
+        self.user.set_password('new-password')
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertRedirects(
+            response, f'{reverse("users:login")}?next={self.url}')
+
+
+@override_settings(CACHE_SINGLE_PROCESS=False)
+class LocalCacheAuthTests(TestCase):
+    """С LocMem и несколькими воркерами сессия и пользователь - из базы."""
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='TestUser')
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:post_create')
+        self.client.get(self.url)
+
+    def assertLoggedOut(self):
+        response = self.client.get(self.url)
+        self.assertRedirects(
+            response, f'{reverse("users:login")}?next={self.url}')
+
+    def test_logout_in_other_worker(self):
+        """Сессия, удалённая другим воркером, больше не действует."""
+        Session.objects.all().delete()
+        self.assertLoggedOut()
+
+    def test_deactivation_without_signals(self):
+        """Деактивация через update() действует сразу."""
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertLoggedOut()
+
+    def test_activity_not_written(self):
+        """Отметка активности не пишется в базу и не прижимает клиента."""
+        self.client.cookies.pop(settings.REPLICA_PIN_COOKIE, None)
+        response = self.client.get(self.url)
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        session = Session.objects.get()
+        self.assertNotIn('last_activity', session.get_decoded())
+
+
+@override_settings(CACHE_SINGLE_PROCESS=True)
+class LazySessionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        session = SessionStore()
+        session['user'] = 1
+        session.create()
+        self.key = session.session_key
+
+    def test_lazy_key_goes_to_cache_only(self):
+        """Изменение только ленивых ключей не пишет сессию в базу."""
+        session = SessionStore(session_key=self.key)
+        session['last_activity'] = int(time.time())
+        with CaptureQueriesContext(connection) as context:
+            session.save()
+        self.assertEqual(context.captured_queries, [])
+        self.assertIn(
+            'last_activity', SessionStore(session_key=self.key).load())
+
+    def test_other_keys_written_to_db(self):
+        """Изменение обычных ключей сразу попадает в базу."""
+        session = SessionStore(session_key=self.key)
+        session['cart'] = [1]
+        with CaptureQueriesContext(connection) as context:
+            session.save()
+        self.assertTrue(context.captured_queries)
+
+    def test_lazy_key_written_after_interval(self):
+        """Ленивые ключи всё же пишутся в базу раз в интервал."""
+        session = SessionStore(session_key=self.key)
+        session.load()
+        session._session[DB_SAVED_AT] -= (
+            settings.SESSION_LAZY_WRITE_INTERVAL + 1)
+        session['last_activity'] = int(time.time())
+        session.save()
+        stored = SessionStore(session_key=self.key).decode(
+            Session.objects.get(pk=self.key).session_data)
+        self.assertIn('last_activity', stored)
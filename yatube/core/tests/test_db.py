@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+
+class SQLiteBackendTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.handler = ConnectionHandler({
+            'default': {
+                'ENGINE': 'core.db.backends.sqlite3',
+                'NAME': os.path.join(self.directory, 'test.db'),
+                'CONN_MAX_AGE': 600,
+                'CONN_HEALTH_CHECKS': True,
+                'OPTIONS': {'pragmas': {'cache_size': -1024}},
+            },
+        })
+        self.connection = self.handler['default']
+
+    def tearDown(self):
+        self.connection.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def pragma(self, name):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self):
+        """Новое соединение получает WAL и настроенные PRAGMA."""
+        expected = {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'cache_size': -1024,
+        }
+        for name, value in expected.items():
+            with self.subTest(pragma=name):
+                self.assertEqual(self.pragma(name), value)
+
+    def test_connection_is_persistent(self):
+        """Соединение переживает конец запроса."""
+        self.connection.ensure_connection()
+        raw = self.connection.connection
+        self.connection.close_if_unusable_or_obsolete()
+        self.connection.ensure_connection()
+        self.assertIs(self.connection.connection, raw)
+
+    def test_broken_connection_is_replaced(self):
+        """Сломанное соединение заменяется при проверке."""
+        self.connection.ensure_connection()
+        raw = self.connection.connection
+        self.connection.close_if_unusable_or_obsolete()
+        raw.close()
+        self.assertEqual(self.pragma('synchronous'), 1)
+        self.assertIsNot(self.connection.connection, raw)
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+CONTENT = bytes(range(256)) * 4
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, MEDIA_ACCEL=None)
+class MediaServeTests(TestCase):
+    url = '/media/posts/image.gif'
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(TEMP_MEDIA_ROOT, 'posts'), exist_ok=True)
+        with open(os.path.join(TEMP_MEDIA_ROOT, 'posts', 'image.gif'),
+                  'wb') as file:
+            file.write(CONTENT)
+        with open(os.path.join(TEMP_MEDIA_ROOT, 'secret.txt'), 'wb') as file:
+            file.write(b'secret')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_full_file(self):
+        """Файл целиком с ETag, Accept-Ranges и типом."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Content-Type'], 'image/gif')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_not_modified(self):
+        """Совпавший If-None-Match - 304 без тела."""
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_ranges(self):
+        """Одиночные диапазоны отдаются с 206 и Content-Range."""
+        size = len(CONTENT)
+        cases = {
+            'bytes=0-9': (0, 9),
+            'bytes=1000-': (1000, size - 1),
+            'bytes=-24': (size - 24, size - 1),
+            'bytes=10-5000': (10, size - 1),
+        }
+        for header, (start, end) in cases.items():
+            with self.subTest(header=header):
+                response = self.client.get(self.url, HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(
+                    response['Content-Range'], f'bytes {start}-{end}/{size}')
+                self.assertEqual(
+                    b''.join(response.streaming_content),
+                    CONTENT[start:end + 1])
+
+    def test_range_ignored_or_rejected(self):
+        """Чужой If-Range даёт весь файл, диапазон за концом - 416."""
+        response = self.client.get(
+            self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"old"')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(
+            response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_access_denied(self):
+        """Вне открытых каталогов и за MEDIA_ROOT файлы не отдаются."""
+        for url in ('/media/secret.txt', '/media/posts/../secret.txt',
+                    '/media/posts/.hidden', '/media/posts/missing.gif'):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    @override_settings(MEDIA_ACCEL='x-accel-redirect')
+    def test_x_accel_redirect(self):
+        """С nginx отдаётся только заголовок внутреннего адреса."""
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response['X-Accel-Redirect'], '/protected-media/posts/image.gif')
+        self.assertEqual(response.content, b'')
+
+    @override_settings(MEDIA_ACCEL='x-sendfile')
+    def test_x_sendfile(self):
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response['X-Sendfile'],
+            os.path.join(TEMP_MEDIA_ROOT, 'posts', 'image.gif'))
@@ -0,0 +1,44 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core import metrics
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_metrics_collected_per_view(self):
+        """После запроса к ленте её метрики видны на /metrics."""
+        self.client.get(reverse('posts:index'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        content = response.content.decode()
+        for name in (
+            'yatube_request_duration_seconds_count{view="posts:index"}',
+            'yatube_db_queries_per_request_sum{view="posts:index"}',
+            'yatube_template_render_seconds_count{view="posts:index"}',
+            'yatube_cache_requests_total{view="posts:index",result="miss"}',
+        ):
+            with self.subTest(name=name):
+                self.assertIn(name, content)
+
+    def test_get_many_counted_per_key(self):
+        """get_many считает попадание или промах по каждому ключу."""
+        cache.set('a', 1)
+        stats = metrics.start_request()
+        try:
+            cache.get_many(['a', 'b', 'c'])
+        finally:
+            metrics.finish_request()
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (1, 2))
+
+    def test_metrics_forbidden_for_other_ips(self):
+        """/metrics закрыт для адресов не из METRICS_ALLOWED_IPS."""
+        response = self.client.get(
+            reverse('metrics'), REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+from .. import ratelimit
+
+User = get_user_model()
+
+
+@override_settings(RATELIMITS={
+    'post_create': {'user': (2, 60), 'ip': (3, 60)},
+    'follow': {'user': (1, 60)},
+})
+class RateLimitTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='TestUser')
+        cls.other = User.objects.create_user(username='OtherUser')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def create_post(self, client):
+        return client.post(reverse('posts:post_create'), {'text': 'Спам'})
+
+    def test_user_limit(self):
+        """Сверх лимита пользователя - 429 с Retry-After, без записи."""
+        for _ in range(2):
+            self.assertEqual(self.create_post(self.client).status_code, 302)
+        response = self.create_post(self.client)
+        self.assertEqual(response.status_code, 429)
+        self.assertTemplateUsed(response, 'core/429.html')
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(Post.objects.count(), 2)
+
+    def test_ip_limit_shared_by_users(self):
+        """Лимит по IP общий для всех пользователей с этого адреса."""
+        other = Client()
+        other.force_login(self.other)
+        statuses = [
+            self.create_post(client).status_code
+            for client in (self.client, other, self.client, other)
+        ]
+        self.assertEqual(statuses, [302, 302, 302, 429])
+
+    def test_safe_methods_not_counted(self):
+        """GET формы создания поста не расходует лимит."""
+        for _ in range(5):
+            self.client.get(reverse('posts:post_create'))
+        self.assertEqual(self.create_post(self.client).status_code, 302)
+
+    def test_follow_limited_on_get(self):
+        """Подписка по ссылке тоже ограничена."""
+        url = reverse('posts:profile_follow', args=(self.other.username,))
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.assertEqual(self.client.get(url).status_code, 429)
+
+    def test_window_slides(self):
+        """Вклад прошлого окна убывает по мере хода текущего."""
+        key = 'ratelimit:test'
+        self.assertEqual(ratelimit.hit(key, 2, 60, now=60 * 10), 0)
+        self.assertEqual(ratelimit.hit(key, 2, 60, now=60 * 10 + 1), 0)
+        # начало следующего окна: прошлые 2 запроса ещё почти целиком
+        self.assertGreater(ratelimit.hit(key, 2, 60, now=60 * 11 + 1), 0)
+        # конец окна: прошлое почти не весит
+        self.assertEqual(ratelimit.hit(key, 3, 60, now=60 * 11 + 59), 0)
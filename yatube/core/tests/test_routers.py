@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import Client, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTests(TransactionTestCase):
+    # реплика в тестах - зеркало default, поэтому данные должны быть
+    # закоммичены, иначе её соединение упрётся в блокировку таблиц
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='TestAuthor')
+        Post.objects.create(author=self.author, text='Тест')
+        self.client = Client()
+        self.client.force_login(self.author)
+
+    def get_queries(self, alias, url):
+        with CaptureQueriesContext(connections[alias]) as context:
+            self.client.get(url)
+        return context.captured_queries
+
+    def test_feed_reads_go_to_replica(self):
+        """Чтение ленты идёт с реплики, а не из основной базы."""
+        self.client.cookies.pop(settings.REPLICA_PIN_COOKIE, None)
+        queries = self.get_queries('replica', reverse('posts:index'))
+        self.assertTrue(
+            any('posts_post' in query['sql'] for query in queries))
+
+    def test_other_views_read_primary(self):
+        """Страницы вне REPLICA_READ_VIEWS читают основную базу."""
+        queries = self.get_queries('replica', reverse('posts:post_create'))
+        self.assertEqual(queries, [])
+
+    def test_client_pinned_after_write(self):
+        """После записи клиент какое-то время читает основную базу."""
+        response = self.client.post(
+            reverse('posts:post_create'), {'text': 'Новый пост'})
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        queries = self.get_queries('replica', reverse('posts:index'))
+        self.assertEqual(queries, [])
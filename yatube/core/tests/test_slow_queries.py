@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+from ..db.slow_queries import normalize
+
+User = get_user_model()
+
+
+class NormalizeTests(SimpleTestCase):
+    def test_literals_and_in_lists_collapsed(self):
+        """Запросы, отличающиеся только значениями, совпадают."""
+        self.assertEqual(
+            normalize("SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s)"),
+            normalize("SELECT *  FROM t WHERE a = 'y' AND b IN (%s)"),
+        )
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+class SlowQueryLogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user(username='TestAuthor')
+        Post.objects.create(author=author, text='Тестовый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_queries_attributed_to_view_and_template(self):
+        """Запись журнала указывает view и шаблон, вызвавший запрос."""
+        with self.assertLogs('yatube.slow_queries') as logs:
+            Client().get(reverse('posts:index'))
+        entries = [json.loads(record.getMessage()) for record in logs.records]
+        self.assertTrue(all(
+            entry['view'] == 'posts:index' for entry in entries))
+        templates = {entry['template'] for entry in entries}
+        self.assertTrue(any(
+            template and template.startswith('posts/index.html')
+            for template in templates
+        ))
+
+    def test_report_aggregates_log(self):
+        """Отчёт группирует записи по нормализованному SQL."""
+        log = os.path.join(self.directory, 'slow.log')
+        with open(log, 'w', encoding='utf-8') as file:
+            for duration in (5, 7):
+                file.write(json.dumps({
+                    'sql': 'SELECT ? FROM t', 'params': 'x',
+                    'duration_ms': duration, 'view': 'posts:index',
+                    'template': 'posts/index.html:3', 'frame': None,
+                }) + '\n')
+        out = StringIO()
+        call_command('slow_query_report', log=log, stdout=out)
+        self.assertIn('12.0ms total', out.getvalue())
+        self.assertIn('2 calls', out.getvalue())
@@ -0,0 +1,133 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+
+from .. import static, storage
+
+SOURCE_CSS = '''/* тема */
+body {
+    color : red ;
+    margin: 0 auto;
+}
+''' + ''.join(f'.item-{i} {{ padding: {i}px; }}\n' for i in range(40))
+SOURCE_JS = '''// отправка формы
+function hello() {
+    return 'hi';
+}
+''' * 20
+
+
+class MinifyTests(TestCase):
+    def test_minify_css(self):
+        """Из CSS уходят комментарии и лишние пробелы."""
+        self.assertEqual(
+            storage.minify_css('/* x */ a > b , c { color : red ; }'),
+            'a>b,c{color:red}')
+
+    def test_minify_js(self):
+        """Из JS уходят отступы и строки-комментарии, код не трогается."""
+        self.assertEqual(
+            storage.minify_js("// c\n  var a = '//';\n\n  f(a);\n"),
+            "var a = '//';\nf(a);")
+
+
+@override_settings(
+    STATICFILES_STORAGE='core.storage.CompressedManifestStaticFilesStorage')
+class BrotliCheckTests(TestCase):
+    def test_warns_without_brotli(self):
+        with mock.patch.object(storage, 'brotli', None):
+            errors = storage.check_brotli(None)
+        self.assertEqual([error.id for error in errors], ['core.W001'])
+
+    def test_silent_with_brotli(self):
+        with mock.patch.object(storage, 'brotli', object()):
+            self.assertEqual(storage.check_brotli(None), [])
+
+
+class CollectStaticTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.source = tempfile.mkdtemp()
+        cls.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(cls.source, 'css'))
+        with open(os.path.join(cls.source, 'css', 'site.css'), 'w') as file:
+            file.write(SOURCE_CSS)
+        with open(os.path.join(cls.source, 'app.js'), 'w') as file:
+            file.write(SOURCE_JS)
+        cls.override = override_settings(
+            STATICFILES_DIRS=[cls.source],
+            STATIC_ROOT=cls.root,
+            STATICFILES_FINDERS=[
+                'django.contrib.staticfiles.finders.FileSystemFinder'],
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'),
+        )
+        cls.override.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with open(os.path.join(cls.root, 'staticfiles.json')) as file:
+            cls.paths = json.load(file)['paths']
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.override.disable()
+        shutil.rmtree(cls.source, ignore_errors=True)
+        shutil.rmtree(cls.root, ignore_errors=True)
+        super().tearDownClass()
+
+    def read(self, name, mode='r'):
+        with open(os.path.join(self.root, name), mode) as file:
+            return file.read()
+
+    def test_hashed_and_minified(self):
+        """Файлы получают хэш в имени и минифицируются."""
+        hashed = self.paths['css/site.css']
+        self.assertRegex(hashed, r'^css/site\.[0-9a-f]{12}\.css$')
+        self.assertTrue(self.read(hashed).startswith('body{color:red;'))
+        self.assertNotIn('отправка', self.read(self.paths['app.js']))
+
+    def test_gzip_variant(self):
+        """Рядом лежит gzip-вариант того же содержимого."""
+        hashed = self.paths['css/site.css']
+        self.assertEqual(
+            gzip.decompress(self.read(hashed + '.gz', 'rb')),
+            self.read(hashed, 'rb'))
+
+    @skipUnless(storage.brotli, 'brotli не установлен')
+    def test_brotli_variant(self):
+        hashed = self.paths['css/site.css']
+        self.assertEqual(
+            storage.brotli.decompress(self.read(hashed + '.br', 'rb')),
+            self.read(hashed, 'rb'))
+
+    def test_serve_precompressed(self):
+        """Отдаётся сжатый вариант и вечный кэш для файла с хэшем."""
+        url = settings.STATIC_URL + self.paths['css/site.css']
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(
+            gzip.decompress(b''.join(response.streaming_content)),
+            self.read(self.paths['css/site.css'], 'rb'))
+
+    def test_serve_plain(self):
+        """Без Accept-Encoding - исходный файл; без хэша - no-cache."""
+        response = self.client.get(settings.STATIC_URL + 'css/site.css')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+    def test_serve_missing(self):
+        """Несуществующий файл и выход за STATIC_ROOT - 404."""
+        for path in ('nope.css', '../secret.txt'):
+            with self.subTest(path=path):
+                with self.assertRaises(Http404):
+                    static.serve(RequestFactory().get('/'), path)
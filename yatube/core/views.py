@@ -1,7 +1,12 @@
 from http import HTTPStatus
 
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
 from django.shortcuts import render
 
+from . import metrics as metrics_registry
+
 
 def page_not_found(request, exception):
     return render(request, 'core/404.html', {
@@ -19,3 +24,12 @@ def permission_denied(request, exception):
 
 def csrf_failure(request, reason=''):
     return render(request, 'core/403csrf.html')
+
+
+def metrics(request):
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise PermissionDenied
+    return HttpResponse(
+        metrics_registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
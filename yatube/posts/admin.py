@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import Post, Group, Comment, Follow
+from .models import (
+    Post, Group, Comment, Follow, ArchivedPost, NearDuplicate,
+)
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -28,7 +30,44 @@ class FollowAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class ArchivedPostAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'text', 'pub_date', 'author', 'group', 'archived')
+    search_fields = ('text',)
+    list_filter = ('pub_date',)
+    empty_value_display = '-пусто-'
+
+
+def delete_duplicate_posts(modeladmin, request, queryset):
+    posts = Post.objects.filter(pk__in=queryset.values('post_id'))
+    deleted = len(posts)
+    for post in posts:
+        post.delete()
+    modeladmin.message_user(request, f'Удалено постов: {deleted}')
+
+
+delete_duplicate_posts.short_description = 'Удалить посты-копии'
+
+
+class NearDuplicateAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'post', 'original', 'similarity', 'author',
+                    'found')
+    list_select_related = ('post__author', 'original')
+    list_filter = ('found',)
+    raw_id_fields = ('post', 'original')
+    actions = (delete_duplicate_posts,)
+
+    def author(self, obj):
+        return obj.post.author
+
+    author.short_description = 'Автор копии'
+
+    def has_add_permission(self, request):
+        return False
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Follow, FollowAdmin)
+admin.site.register(ArchivedPost, ArchivedPostAdmin)
+admin.site.register(NearDuplicate, NearDuplicateAdmin)
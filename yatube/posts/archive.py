@@ -0,0 +1,123 @@
+"""Перенос старых постов в архивные таблицы и чтение из обеих."""
+from django.db import transaction
+from django.http import Http404
+
+from .models import ArchivedComment, ArchivedPost, Comment, Post, PostViews
+
+
+class ArchiveChain:
+    """Горячие посты, за ними архивные, как одна последовательность.
+
+    Архивируются только посты старше порога, поэтому при сортировке по
+    убыванию даты архивные всегда идут после горячих. Paginator
+    использует только ``count()``, ``bounded_count()`` и срезы.
+    """
+    def __init__(self, *querysets):
+        self.querysets = querysets
+        self._counts = None
+
+    def counts(self):
+        if self._counts is None:
+            self._counts = [queryset.count() for queryset in self.querysets]
+        return self._counts
+
+    def count(self):
+        return sum(self.counts())
+
+    def __len__(self):
+        return self.count()
+
+    def bounded_count(self, limit):
+        total = 0
+        for queryset in self.querysets:
+            total += queryset[:limit - total].count()
+            if total >= limit:
+                break
+        return total
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        # размеры частей не нужны: если часть кончилась раньше среза,
+        # её размер виден по выборке, иначе хватает COUNT до start
+        start, stop = key.start or 0, key.stop
+        result = []
+        for queryset in self.querysets:
+            if stop is not None and stop <= 0:
+                break
+            chunk = list(queryset[start:stop])
+            result.extend(chunk)
+            if chunk:
+                size = start + len(chunk)
+            else:
+                size = queryset[:start].count() if start else 0
+            start = max(0, start - size)
+            if stop is not None:
+                stop -= size
+        return result
+
+
+def author_posts(author):
+    return ArchiveChain(
+        author.posts.select_related('author', 'group'),
+        author.archived_posts.select_related('author', 'group'),
+    )
+
+
+def get_post_or_404(post_id):
+    """Возвращает пост и признак того, что он из архива."""
+    for model in (Post, ArchivedPost):
+        post = model.objects.select_related(
+            'author', 'group').filter(pk=post_id).first()
+        if post is not None:
+            return post, model is ArchivedPost
+    raise Http404('Пост не найден')
+
+
+def archive_posts(cutoff, batch_size=500):
+    """Переносит посты старше cutoff вместе с комментариями.
+
+    Число просмотров копируется в ``ArchivedPost.views``; рейтинг
+    популярного и похожие посты архивным не нужны и удаляются с постом.
+
+    Каждая пачка переносится в отдельной транзакции, чтобы не держать
+    блокировку базы надолго. Возвращает число перенесённых постов.
+    """
+    moved = 0
+    while True:
+        with transaction.atomic():
+            posts = list(
+                Post.objects.filter(pub_date__lt=cutoff)
+                .order_by('pk')[:batch_size]
+            )
+            if not posts:
+                return moved
+            ids = [post.pk for post in posts]
+            views = dict(PostViews.objects.filter(
+                post_id__in=ids).values_list('post_id', 'views'))
+            ArchivedPost.objects.bulk_create(
+                ArchivedPost(
+                    id=post.pk,
+                    text=post.text,
+                    pub_date=post.pub_date,
+                    author_id=post.author_id,
+                    group_id=post.group_id,
+                    image=post.image.name,
+                    views=views.get(post.pk, 0),
+                )
+                for post in posts
+            )
+            comments = Comment.objects.filter(post_id__in=ids)
+            ArchivedComment.objects.bulk_create(
+                ArchivedComment(
+                    id=comment.pk,
+                    post_id=comment.post_id,
+                    author_id=comment.author_id,
+                    text=comment.text,
+                    created=comment.created,
+                )
+                for comment in comments
+            )
+            comments.delete()
+            Post.objects.filter(pk__in=ids).delete()
+        moved += len(posts)
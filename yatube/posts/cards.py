@@ -0,0 +1,64 @@
+"""Кэш отрисованных карточек постов.
+
+Карточка хранится вместе с версией - хэшем всего, что в ней выводится.
+Лента достаёт все карточки страницы одним ``get_many`` и рисует только
+промахи и устаревшие версии. Сигналы ``Post`` удаляют карточки сразу,
+а смена имени автора или адреса группы меняет версию.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = 'includes/post_article.html'
+VARIANTS = ('00', '01', '10', '11')
+
+
+def card_key(post_id, variant):
+    return f'post_card:{post_id}:{variant}'
+
+
+def card_keys(post_id):
+    return [card_key(post_id, variant) for variant in VARIANTS]
+
+
+def card_version(post):
+    author = post.author
+    group = post.group
+    parts = (
+        post.text, post.image.name, str(post.pub_date),
+        author.username, author.first_name, author.last_name,
+        group.slug if group else '',
+    )
+    return hashlib.md5('\x00'.join(parts).encode()).hexdigest()
+
+
+def render_cards(posts, show_group=False, hide_info=False):
+    posts = list(posts)
+    variant = f'{int(show_group)}{int(hide_info)}'
+    keys = [card_key(post.pk, variant) for post in posts]
+    cached = cache.get_many(keys)
+    fragments = []
+    missing = {}
+    for post, key in zip(posts, keys):
+        version = card_version(post)
+        entry = cached.get(key)
+        if entry is not None and entry[0] == version:
+            fragments.append(mark_safe(entry[1]))
+            continue
+        fragment = render_to_string(CARD_TEMPLATE, {
+            'post': post,
+            'show_group': show_group,
+            'hide_info': hide_info,
+        })
+        missing[key] = (version, str(fragment))
+        fragments.append(fragment)
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_CACHE_TIMEOUT)
+    return fragments
+
+
+def invalidate(post_id):
+    cache.delete_many(card_keys(post_id))
@@ -0,0 +1,76 @@
+"""Рекомендации «кого почитать» из графа подписок.
+
+Команда ``build_suggestions`` читает граф из ``Follow`` и кладёт в
+отдельный кэш ``FOLLOW_GRAPH_CACHE`` готовый топ рекомендаций каждого
+пользователя - друзей друзей, на которых он ещё не подписан. Виджет
+делает одно чтение из кэша и один запрос пользователей; авторы, на
+которых подписались после пересчёта, отсеиваются в этом же запросе,
+поэтому подписка и отписка кэш не трогают. Рекомендации живут, сколько
+задано таймаутом кэша: команду нужно запускать чаще.
+"""
+from array import array
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+
+from .models import Follow
+
+User = get_user_model()
+
+
+def graph_cache():
+    return caches[settings.FOLLOW_GRAPH_CACHE]
+
+
+def suggestions_key(user_id):
+    return f'suggestions:{user_id}'
+
+
+def rank(user_id, following, adjacency, top):
+    """Топ друзей друзей по числу общих подписок."""
+    counts = Counter()
+    for friend in following:
+        counts.update(adjacency(friend))
+    counts.pop(user_id, None)
+    for author_id in following:
+        counts.pop(author_id, None)
+    return [author_id for author_id, _ in counts.most_common(top)]
+
+
+def rebuild(top, chunk_size=1000):
+    """Пересчитывает рекомендации всех пользователей.
+
+    Граф читается из базы одним проходом в память: так друзья друзей
+    считаются без запросов к кэшу. Возвращает число пользователей.
+    """
+    edges = Follow.objects.order_by('user_id', 'author_id').values_list(
+        'user_id', 'author_id').iterator(chunk_size=chunk_size)
+    adjacency = {
+        user_id: array('I', (author_id for _, author_id in group))
+        for user_id, group in groupby(edges, key=itemgetter(0))
+    }
+    empty = array('I')
+    items = {}
+    for user_id, following in adjacency.items():
+        items[suggestions_key(user_id)] = rank(
+            user_id, following,
+            lambda friend: adjacency.get(friend, empty), top)
+        if len(items) >= chunk_size:
+            graph_cache().set_many(items)
+            items = {}
+    graph_cache().set_many(items)
+    return len(adjacency)
+
+
+def get_suggested_authors(user, limit=None):
+    """Рекомендованные авторы из готового топа, без пересчёта."""
+    if not user.is_authenticated:
+        return []
+    ids = graph_cache().get(suggestions_key(user.pk)) or []
+    authors = User.objects.exclude(following__user=user).in_bulk(ids)
+    found = [authors[author_id] for author_id in ids if author_id in authors]
+    return found[:limit or settings.SUGGESTIONS_SHOWN]
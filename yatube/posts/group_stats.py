@@ -0,0 +1,96 @@
+"""Каталог групп: число постов, последний пост и посты за неделю.
+
+Сводки лежат в ``GroupStats``, посты за неделю складываются из дневных
+счётчиков ``GroupDailyPosts``. Сигналы модели Post правят их на месте
+при создании, переносе в другую группу и удалении поста, так что
+каталог - один запрос, который к тому же кэшируется. Посты, созданные
+в обход сигналов (``bulk_create``, ``seed_load``), учтёт команда
+``rebuild_group_stats``; она же удаляет дневные счётчики старше окна.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Group, GroupDailyPosts, GroupStats, Post
+
+DIRECTORY_KEY = 'group_directory'
+
+
+def window_start():
+    """Первый день окна «постов за неделю»."""
+    days = settings.GROUP_RECENT_DAYS - 1
+    return timezone.localdate() - timedelta(days=days)
+
+
+def record(group_id, pub_date, delta):
+    """Учитывает появление (delta=1) или исчезновение (-1) поста."""
+    day = timezone.localdate(pub_date)
+    with transaction.atomic():
+        stats, _ = GroupStats.objects.get_or_create(group_id=group_id)
+        rows = GroupStats.objects.filter(pk=group_id)
+        rows.update(posts_count=F('posts_count') + delta)
+        if delta > 0:
+            rows.filter(
+                Q(last_pub_date__lt=pub_date) | Q(last_pub_date__isnull=True)
+            ).update(last_pub_date=pub_date)
+        elif stats.last_pub_date and pub_date >= stats.last_pub_date:
+            # ушёл последний пост группы: ищем предыдущий
+            latest = Post.objects.filter(group_id=group_id).aggregate(
+                latest=Max('pub_date'))['latest']
+            rows.update(last_pub_date=latest)
+        if day >= window_start():
+            GroupDailyPosts.objects.get_or_create(group_id=group_id, day=day)
+            GroupDailyPosts.objects.filter(group_id=group_id, day=day).update(
+                posts_count=F('posts_count') + delta)
+    cache.delete(DIRECTORY_KEY)
+
+
+def directory():
+    """Группы со сводками, самые активные первыми."""
+    groups = cache.get(DIRECTORY_KEY)
+    if groups is None:
+        groups = list(Group.objects.annotate(
+            posts_count=Coalesce(F('stats__posts_count'), 0),
+            last_pub_date=F('stats__last_pub_date'),
+            recent_count=Coalesce(Sum(
+                'daily_posts__posts_count',
+                filter=Q(daily_posts__day__gte=window_start())), 0),
+        ).order_by(
+            F('last_pub_date').desc(nulls_last=True), 'title'))
+        cache.set(DIRECTORY_KEY, groups, settings.GROUP_DIRECTORY_TIMEOUT)
+    return groups
+
+
+def rebuild():
+    """Пересчитывает сводки по таблице постов, возвращает число групп."""
+    posts = Post.objects.filter(group__isnull=False).order_by()
+    totals = posts.values('group_id').annotate(
+        total=Count('pk'), latest=Max('pub_date'))
+    days = posts.filter(pub_date__date__gte=window_start()).values(
+        'group_id', 'pub_date__date').annotate(total=Count('pk'))
+    with transaction.atomic():
+        GroupStats.objects.all().delete()
+        GroupDailyPosts.objects.all().delete()
+        GroupStats.objects.bulk_create(
+            GroupStats(
+                group_id=row['group_id'],
+                posts_count=row['total'],
+                last_pub_date=row['latest'],
+            )
+            for row in totals
+        )
+        GroupDailyPosts.objects.bulk_create(
+            GroupDailyPosts(
+                group_id=row['group_id'],
+                day=row['pub_date__date'],
+                posts_count=row['total'],
+            )
+            for row in days
+        )
+    cache.delete(DIRECTORY_KEY)
+    return len(totals)
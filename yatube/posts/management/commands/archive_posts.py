@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts.archive import archive_posts
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые посты и их комментарии в архивные таблицы.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.POST_ARCHIVE_AFTER_DAYS,
+            help='Архивировать посты старше стольких дней.',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, days, batch_size, **options):
+        cutoff = timezone.now() - timedelta(days=days)
+        moved = archive_posts(cutoff, batch_size=batch_size)
+        self.stdout.write(f'Перенесено постов: {moved}')
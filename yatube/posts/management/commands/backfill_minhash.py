@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.minhash import index_post, signature, to_db
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Считает MinHash существующих постов, заполняет индекс полос и '
+        'ищет похожие посты. Таблица читается пачками по id.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, chunk_size, **options):
+        last_pk = total = found = 0
+        while True:
+            rows = list(
+                Post.objects.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', 'text')[:chunk_size]
+            )
+            if not rows:
+                break
+            posts = [
+                Post(pk=pk, minhash=to_db(signature(text)))
+                for pk, text in rows
+            ]
+            # отпечатки пачки пишутся до поиска, полосы - по порядку id,
+            # поэтому пост сравнивается только с более ранними
+            with transaction.atomic():
+                Post.objects.bulk_update(posts, ['minhash'])
+                for post in posts:
+                    found += len(index_post(post.pk, post.minhash))
+            last_pk = rows[-1][0]
+            total += len(rows)
+            self.stdout.write(f'\rПостов: {total}, совпадений: {found}',
+                              ending='')
+        self.stdout.write('')
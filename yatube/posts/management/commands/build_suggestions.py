@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.follow_graph import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает топ рекомендованных авторов для каждого '
+        'пользователя.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top', type=int, default=settings.SUGGESTIONS_TOP,
+            help='Сколько рекомендаций хранить на пользователя.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, top, chunk_size, **options):
+        users = rebuild(top, chunk_size=chunk_size)
+        self.stdout.write(f'Пользователей с рекомендациями: {users}')
@@ -0,0 +1,33 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts import trending
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет затухшие рейтинги ленты популярного, с --rebuild '
+        'пересчитывает их по постам и комментариям.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Пересчитать рейтинги с нуля.',
+        )
+        parser.add_argument(
+            '--days', type=int, default=settings.TRENDING_REBUILD_DAYS,
+            help='За сколько дней учитывать события при пересчёте.',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, rebuild, days, batch_size, **options):
+        if rebuild:
+            since = timezone.now() - timedelta(days=days)
+            total = trending.rebuild(since, batch_size=batch_size)
+            self.stdout.write(f'Пересчитано рейтингов: {total}')
+        removed = trending.compact(batch_size=batch_size)
+        self.stdout.write(f'Удалено затухших рейтингов: {removed}')
@@ -0,0 +1,235 @@
+import heapq
+import random
+from array import array
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connections, router, transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+SENTENCES_POOL = 5000
+NAMES_POOL = 500
+
+
+def insert_raw(model, objects):
+    """Вставка как у loaddata: значения пишутся как есть.
+
+    ``bulk_create`` подставляет в поля с ``auto_now_add`` текущее время,
+    а сгенерированные даты нужно сохранить. Поле модели при этом не
+    меняется, поэтому другие потоки процесса этого не замечают.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key
+    ]
+    using = router.db_for_write(model)
+    size = connections[using].ops.bulk_batch_size(fields, objects) or 1
+    for start in range(0, len(objects), size):
+        model._base_manager._insert(
+            objects[start:start + size], fields=fields, raw=True,
+            using=using)
+
+
+def chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, группами, постами, '
+        'комментариями и подписками для нагрузочного тестирования.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=20000)
+        parser.add_argument(
+            '--follows', type=int, default=20000,
+            help='Общее число подписок.',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--alpha', type=float, default=1.1,
+            help='Показатель степенного распределения популярности авторов.',
+        )
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='За сколько дней распределить даты постов.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.rnd = random.Random(options['seed'])
+        fake = Faker('ru_RU')
+        fake.seed_instance(options['seed'])
+        self.chunk_size = options['chunk_size']
+        self.sentences = [fake.sentence() for _ in range(SENTENCES_POOL)]
+        self.first_names = [fake.first_name() for _ in range(NAMES_POOL)]
+        self.last_names = [fake.last_name() for _ in range(NAMES_POOL)]
+        self.now = timezone.now()
+        prefix = f'load{options["seed"]}_'
+
+        user_ids = self.create_users(prefix, options['users'])
+        group_ids = self.create_groups(prefix, options['groups'], fake)
+        # популярность авторов по закону Ципфа: вес автора ранга r
+        # пропорционален 1 / r ** alpha, ранги перемешаны
+        ranks = list(range(1, len(user_ids) + 1))
+        self.rnd.shuffle(ranks)
+        popularity = list(accumulate(
+            1 / rank ** options['alpha'] for rank in ranks))
+        post_ids, post_dates = self.create_posts(
+            user_ids, group_ids, popularity, options['posts'],
+            options['days'])
+        self.create_comments(
+            user_ids, post_ids, post_dates, options['comments'])
+        self.create_follows(user_ids, popularity, options['follows'])
+
+    def bulk_create(self, model, objects, raw=False, **kwargs):
+        total = 0
+        for chunk in chunks(objects, self.chunk_size):
+            with transaction.atomic():
+                if raw:
+                    insert_raw(model, chunk)
+                else:
+                    model.objects.bulk_create(chunk, **kwargs)
+            total += len(chunk)
+            self.stdout.write(
+                f'\r{model._meta.verbose_name_plural}: {total}', ending='')
+        self.stdout.write('')
+
+    def text(self, low, high):
+        return ' '.join(self.rnd.choices(
+            self.sentences, k=self.rnd.randint(low, high)))
+
+    def create_users(self, prefix, count):
+        password = make_password(None)
+        self.bulk_create(User, (
+            User(
+                username=f'{prefix}{i}',
+                first_name=self.rnd.choice(self.first_names),
+                last_name=self.rnd.choice(self.last_names),
+                email=f'{prefix}{i}@example.com',
+                password=password,
+            )
+            for i in range(count)
+        ))
+        return list(
+            User.objects.filter(username__startswith=prefix)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def create_groups(self, prefix, count, fake):
+        slug = prefix.replace('_', '-')
+        self.bulk_create(Group, (
+            Group(
+                title=fake.catch_phrase()[:200],
+                slug=f'{slug}{i}',
+                description=self.text(1, 3),
+            )
+            for i in range(count)
+        ))
+        return list(
+            Group.objects.filter(slug__startswith=slug)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def create_posts(self, user_ids, group_ids, popularity, count, days):
+        span = days * 24 * 3600
+        # даты по возрастанию, чтобы id росли вместе с датой, как в жизни
+        offsets = sorted(
+            (self.rnd.random() * span for _ in range(count)), reverse=True)
+        last_id = Post.objects.aggregate(last=Max('pk'))['last'] or 0
+        authors = self.rnd.choices(user_ids, cum_weights=popularity, k=count)
+        self.bulk_create(Post, (
+            Post(
+                text=self.text(1, 6),
+                author_id=author_id,
+                group_id=(
+                    self.rnd.choice(group_ids)
+                    if group_ids and self.rnd.random() < 0.7 else None
+                ),
+                pub_date=self.now - timedelta(seconds=offset),
+            )
+            for author_id, offset in zip(authors, offsets)
+        ), raw=True)
+        post_ids = array('q', Post.objects.filter(pk__gt=last_id)
+                         .order_by('pk').values_list('pk', flat=True)
+                         .iterator())
+        return post_ids, array('d', offsets)
+
+    def create_comments(self, user_ids, post_ids, post_dates, count):
+        if not post_ids:
+            return
+
+        def comments():
+            for _ in range(count):
+                index = self.rnd.randrange(len(post_dates))
+                # комментарий появляется после поста
+                offset = self.rnd.random() * post_dates[index]
+                yield Comment(
+                    post_id=post_ids[index],
+                    author_id=self.rnd.choice(user_ids),
+                    text=self.text(1, 2),
+                    created=self.now - timedelta(seconds=offset),
+                )
+
+        self.bulk_create(Comment, comments(), raw=True)
+
+    def create_follows(self, user_ids, popularity, count):
+        size = len(user_ids)
+        count = min(count, size * (size - 1))
+        # когда занята больше половины пар, случайные попытки почти всегда
+        # попадают в уже выбранные: выбираем из всех пар сразу
+        if 2 * count > size * (size - 1):
+            edges = self.all_pairs_follows(size, popularity, count)
+        else:
+            edges = self.random_follows(size, popularity, count)
+        self.bulk_create(Follow, (
+            Follow(user_id=user_ids[user], author_id=user_ids[author])
+            for user, author in edges
+        ), ignore_conflicts=True)
+
+    def random_follows(self, size, popularity, count):
+        seen = set()
+        while len(seen) < count:
+            user = self.rnd.randrange(size)
+            author = self.rnd.choices(range(size), cum_weights=popularity)[0]
+            edge = user * size + author
+            if user == author or edge in seen:
+                continue
+            seen.add(edge)
+            yield user, author
+
+    def all_pairs_follows(self, size, popularity, count):
+        """count пар из всех, без повторов, с весом по популярности автора.
+
+        Взвешенная выборка без возвращения: у пары ключ random() ** (1 / w),
+        берутся count наибольших.
+        """
+        weights = [
+            high - low for low, high in zip([0.0] + popularity, popularity)]
+        pairs = (
+            (self.rnd.random() ** (1 / weights[author]), user, author)
+            for user in range(size) for author in range(size)
+            if user != author
+        )
+        for _, user, author in heapq.nlargest(count, pairs):
+            yield user, author
@@ -0,0 +1,43 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_postscore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group', verbose_name='Группа')),
+                ('posts_count', models.IntegerField(default=0, verbose_name='Постов')),
+                ('last_pub_date', models.DateTimeField(blank=True, null=True, verbose_name='Последний пост')),
+            ],
+            options={
+                'verbose_name': 'Статистика группы',
+                'verbose_name_plural': 'Статистика групп',
+            },
+        ),
+        migrations.CreateModel(
+            name='GroupDailyPosts',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('posts_count', models.IntegerField(default=0, verbose_name='Постов')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_posts', to='posts.Group', verbose_name='Группа')),
+            ],
+            options={
+                'verbose_name': 'Посты группы за день',
+                'verbose_name_plural': 'Посты групп по дням',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='groupdailyposts',
+            constraint=models.UniqueConstraint(fields=('group', 'day'), name='unique_group_day'),
+        ),
+    ]
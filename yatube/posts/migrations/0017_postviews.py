@@ -0,0 +1,25 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_group_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostViews',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='views', serialize=False, to='posts.Post', verbose_name='Пост')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Просмотры')),
+            ],
+            options={
+                'verbose_name': 'Просмотры поста',
+                'verbose_name_plural': 'Просмотры постов',
+            },
+        ),
+    ]
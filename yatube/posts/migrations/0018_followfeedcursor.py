@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+        ('posts', '0017_postviews'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FollowFeedCursor',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='follow_cursor', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                ('last_seen', models.DateTimeField(verbose_name='Просмотрено')),
+            ],
+            options={
+                'verbose_name': 'Курсор ленты подписок',
+                'verbose_name_plural': 'Курсоры ленты подписок',
+            },
+        ),
+    ]
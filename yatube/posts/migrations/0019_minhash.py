@@ -0,0 +1,50 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0018_followfeedcursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='minhash',
+            field=models.BinaryField(blank=True, null=True, verbose_name='MinHash'),
+        ),
+        migrations.CreateModel(
+            name='PostMinhashBand',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField(db_index=True, verbose_name='Ключ')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='minhash_bands', to='posts.Post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'Полоса MinHash',
+                'verbose_name_plural': 'Полосы MinHash',
+            },
+        ),
+        migrations.CreateModel(
+            name='NearDuplicate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('similarity', models.FloatField(verbose_name='Сходство')),
+                ('found', models.DateTimeField(auto_now_add=True, verbose_name='Найден')),
+                ('original', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='copies', to='posts.Post', verbose_name='Похож на')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='near_duplicates', to='posts.Post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'Похожий пост',
+                'verbose_name_plural': 'Похожие посты',
+                'ordering': ('-found',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='nearduplicate',
+            constraint=models.UniqueConstraint(fields=('post', 'original'), name='unique_near_duplicate'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Max
+from django.utils import timezone
+
+
+def backfill(apps, schema_editor):
+    # посты, созданные до 0016, иначе не попадут в каталог, а их удаление
+    # уведёт счётчики в минус. Тот же подсчёт, что в group_stats.rebuild,
+    # но на исторических моделях
+    Post = apps.get_model('posts', 'Post')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    GroupDailyPosts = apps.get_model('posts', 'GroupDailyPosts')
+    start = timezone.localdate() - timedelta(
+        days=settings.GROUP_RECENT_DAYS - 1)
+    posts = Post.objects.filter(group__isnull=False).order_by()
+    totals = posts.values('group_id').annotate(
+        total=Count('pk'), latest=Max('pub_date'))
+    days = posts.filter(pub_date__date__gte=start).values(
+        'group_id', 'pub_date__date').annotate(total=Count('pk'))
+    GroupStats.objects.all().delete()
+    GroupDailyPosts.objects.all().delete()
+    GroupStats.objects.bulk_create(
+        GroupStats(
+            group_id=row['group_id'],
+            posts_count=row['total'],
+            last_pub_date=row['latest'],
+        )
+        for row in totals
+    )
+    GroupDailyPosts.objects.bulk_create(
+        GroupDailyPosts(
+            group_id=row['group_id'],
+            day=row['pub_date__date'],
+            posts_count=row['total'],
+        )
+        for row in days
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0019_minhash'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0020_backfill_group_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedpost',
+            name='views',
+            field=models.PositiveIntegerField(default=0, verbose_name='Просмотры'),
+        ),
+    ]
@@ -0,0 +1,126 @@
+"""Поиск почти одинаковых постов по MinHash.
+
+Текст - множество слов и пар соседних слов. Его отпечаток - ``PERMS``
+минимумов хэшей этого множества по разным хэш-функциям; доля совпавших
+минимумов у двух текстов оценивает их сходство Жаккара. Отпечаток
+делится на ``BANDS`` полос по ``ROWS`` значений, хэш полосы - строка
+``PostMinhashBand`` с индексом по ключу. Похожие тексты почти наверняка
+совпадают хотя бы в одной полосе, непохожие - почти никогда, поэтому
+кандидатов даёт поиск по индексу, а не перебор всех постов; сходство
+проверяется уже у кандидатов.
+
+Отпечаток считается в сигнале ``pre_save`` модели Post, полосы и
+найденные совпадения пишутся в ``post_save``. Посты, созданные в обход
+сигналов, индексирует команда ``backfill_minhash``.
+"""
+import hashlib
+import random
+import re
+from array import array
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import NearDuplicate, Post, PostMinhashBand
+
+PERMS = 64
+BANDS = 16
+ROWS = PERMS // BANDS
+# хэш-функции вида (a * x + b) mod PRIME, усечённые до 32 бит
+PRIME = (1 << 61) - 1
+MASK = (1 << 32) - 1
+_rnd = random.Random(20240229)
+COEFFICIENTS = [
+    (_rnd.randrange(1, PRIME), _rnd.randrange(PRIME)) for _ in range(PERMS)
+]
+
+_WORD = re.compile(r'\w+')
+
+
+def features(text):
+    """Слова и пары соседних слов."""
+    words = _WORD.findall(text.lower())
+    found = set(words)
+    found.update(' '.join(pair) for pair in zip(words, words[1:]))
+    return found
+
+
+def feature_hash(feature):
+    digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def signature(text):
+    """Отпечаток текста или None, если признаков слишком мало."""
+    found = features(text)
+    if len(found) < settings.MINHASH_MIN_FEATURES:
+        return None
+    hashes = [feature_hash(feature) for feature in found]
+    return array('I', (
+        min((a * value + b) % PRIME for value in hashes) & MASK
+        for a, b in COEFFICIENTS
+    ))
+
+
+def to_db(values):
+    return None if values is None else values.tobytes()
+
+
+def from_db(stored):
+    values = array('I')
+    values.frombytes(bytes(stored))
+    return values
+
+
+def band_keys(values):
+    """Ключи полос: знаковые 64-битные хэши номера полосы и её значений."""
+    keys = []
+    for band in range(BANDS):
+        chunk = values[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(
+            bytes([band]) + chunk.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+def similarity(first, second):
+    """Оценка сходства Жаккара: доля совпавших минимумов."""
+    return sum(x == y for x, y in zip(first, second)) / PERMS
+
+
+def find_similar(post_id, values):
+    """Пары (сходство, id поста) похожих более ранних постов, самые
+    похожие первыми.
+
+    Оригинал - всегда более ранний пост: правка оригинала не должна
+    записать его копией собственной копии.
+    """
+    candidates = PostMinhashBand.objects.filter(
+        key__in=band_keys(values), post_id__lt=post_id).values_list(
+        'post_id', flat=True).distinct()[:settings.MINHASH_MAX_CANDIDATES]
+    rows = Post.objects.filter(pk__in=candidates).values_list('pk', 'minhash')
+    similar = []
+    for pk, stored in rows:
+        score = similarity(values, from_db(stored))
+        if score >= settings.MINHASH_MIN_SIMILARITY:
+            similar.append((score, pk))
+    return sorted(similar, reverse=True)
+
+
+def index_post(post_id, stored, created=False):
+    """Пишет полосы поста и его похожие посты, возвращает последние."""
+    with transaction.atomic():
+        if not created:
+            PostMinhashBand.objects.filter(post_id=post_id).delete()
+            NearDuplicate.objects.filter(post_id=post_id).delete()
+        if stored is None:
+            return []
+        values = from_db(stored)
+        similar = find_similar(post_id, values)
+        PostMinhashBand.objects.bulk_create(
+            PostMinhashBand(post_id=post_id, key=key)
+            for key in band_keys(values))
+        NearDuplicate.objects.bulk_create(
+            NearDuplicate(post_id=post_id, original_id=pk, similarity=score)
+            for score, pk in similar)
+    return similar
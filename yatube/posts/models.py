@@ -44,6 +44,13 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    # отпечаток текста для поиска похожих постов, см. posts/minhash.py
+    minhash = models.BinaryField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="MinHash"
+    )
 
     class Meta:
         ordering = ('-pub_date',)
@@ -107,3 +114,228 @@ class Follow(models.Model):
                 fields=["user", "author"], name="unique_follows_for_user"
             )
         ]
+
+
+class ArchivedPost(models.Model):
+    """Старый пост, перенесённый из Post командой archive_posts."""
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField(verbose_name="Текст поста")
+    pub_date = models.DateTimeField(verbose_name="Дата публикации")
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts',
+        verbose_name="Автор",
+    )
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts',
+        verbose_name="Группа",
+    )
+    image = models.ImageField(
+        'Картинка',
+        upload_to='posts/',
+        blank=True
+    )
+    # PostViews удаляется вместе с постом, число просмотров - здесь
+    views = models.PositiveIntegerField(default=0, verbose_name="Просмотры")
+    archived = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата архивации"
+    )
+
+    class Meta:
+        ordering = ('-pub_date',)
+        verbose_name = "Архивный пост"
+        verbose_name_plural = "Архивные посты"
+
+    def __str__(self) -> str:
+        TEXT_LENGTH = 15
+        return self.text[:TEXT_LENGTH]
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        on_delete=models.CASCADE,
+        related_name='comments',
+        verbose_name="Пост",
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_comments',
+        verbose_name="Автор",
+    )
+    text = models.TextField(verbose_name="Текст комментария")
+    created = models.DateTimeField(verbose_name="Дата публикации")
+
+    class Meta:
+        ordering = ('-created',)
+        verbose_name = "Архивный комментарий"
+        verbose_name_plural = "Архивные комментарии"
+
+    def __str__(self) -> str:
+        TEXT_LENGTH = 15
+        return self.text[:TEXT_LENGTH]
+
+
+class PostScore(models.Model):
+    """Рейтинг поста в ленте популярного, см. posts/trending.py."""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score',
+        verbose_name="Пост",
+    )
+    score = models.FloatField(db_index=True, verbose_name="Рейтинг")
+
+    class Meta:
+        verbose_name = "Рейтинг поста"
+        verbose_name_plural = "Рейтинги постов"
+
+    def __str__(self) -> str:
+        return f'{self.post_id}: {self.score:.3f}'
+
+
+class GroupStats(models.Model):
+    """Сводка по группе для каталога, см. posts/group_stats.py."""
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name="Группа",
+    )
+    posts_count = models.IntegerField(default=0, verbose_name="Постов")
+    last_pub_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Последний пост"
+    )
+
+    class Meta:
+        verbose_name = "Статистика группы"
+        verbose_name_plural = "Статистика групп"
+
+    def __str__(self) -> str:
+        return f'{self.group_id}: {self.posts_count}'
+
+
+class GroupDailyPosts(models.Model):
+    """Число постов группы за день: из них складываются посты за неделю."""
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name='daily_posts',
+        verbose_name="Группа",
+    )
+    day = models.DateField(verbose_name="День")
+    posts_count = models.IntegerField(default=0, verbose_name="Постов")
+
+    class Meta:
+        verbose_name = "Посты группы за день"
+        verbose_name_plural = "Посты групп по дням"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["group", "day"], name="unique_group_day"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.group_id} {self.day}: {self.posts_count}'
+
+
+class PostViews(models.Model):
+    """Число просмотров поста, пишется пачками из posts/view_counter.py."""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='views',
+        verbose_name="Пост",
+    )
+    views = models.PositiveIntegerField(default=0, verbose_name="Просмотры")
+
+    class Meta:
+        verbose_name = "Просмотры поста"
+        verbose_name_plural = "Просмотры постов"
+
+    def __str__(self) -> str:
+        return f'{self.post_id}: {self.views}'
+
+
+class FollowFeedCursor(models.Model):
+    """Когда пользователь последний раз смотрел ленту подписок."""
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='follow_cursor',
+        verbose_name="Пользователь",
+    )
+    last_seen = models.DateTimeField(verbose_name="Просмотрено")
+
+    class Meta:
+        verbose_name = "Курсор ленты подписок"
+        verbose_name_plural = "Курсоры ленты подписок"
+
+    def __str__(self) -> str:
+        return f'{self.user_id}: {self.last_seen}'
+
+
+class PostMinhashBand(models.Model):
+    """Полоса MinHash поста - ключ индекса похожих постов."""
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='minhash_bands',
+        verbose_name="Пост",
+    )
+    key = models.BigIntegerField(db_index=True, verbose_name="Ключ")
+
+    class Meta:
+        verbose_name = "Полоса MinHash"
+        verbose_name_plural = "Полосы MinHash"
+
+    def __str__(self) -> str:
+        return f'{self.post_id}: {self.key}'
+
+
+class NearDuplicate(models.Model):
+    """Пост, почти совпадающий по тексту с более ранним."""
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='near_duplicates',
+        verbose_name="Пост",
+    )
+    original = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='copies',
+        verbose_name="Похож на",
+    )
+    similarity = models.FloatField(verbose_name="Сходство")
+    found = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Найден"
+    )
+
+    class Meta:
+        ordering = ('-found',)
+        verbose_name = "Похожий пост"
+        verbose_name_plural = "Похожие посты"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "original"], name="unique_near_duplicate"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.post_id} ~ {self.original_id}'
@@ -0,0 +1,114 @@
+"""Пагинация лент: окно номеров, кэш и оценка числа постов.
+
+Число постов ленты считается ``COUNT`` с ``LIMIT`` и кэшируется по ключу
+ленты, сигналы моделей сбрасывают ключи. Выше ``FEED_EXACT_COUNT_LIMIT``
+точный подсчёт не делается: берётся оценка планировщика PostgreSQL, а
+на других базах - сам порог. Глубже ``FEED_MAX_PAGES`` страниц лента не
+листается, чтобы краулеры не гоняли запросы с огромным OFFSET.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+ELLIPSIS = '…'
+
+
+def count_key(feed):
+    return f'feed_count:{feed}'
+
+
+def invalidate_counts(*feeds):
+    cache.delete_many([count_key(feed) for feed in feeds])
+
+
+def bounded_count(object_list, limit):
+    """Число объектов, но не больше limit."""
+    if isinstance(object_list, QuerySet):
+        return object_list[:limit].count()
+    if hasattr(object_list, 'bounded_count'):
+        return object_list.bounded_count(limit)
+    return min(len(object_list), limit)
+
+
+def estimate_count(object_list):
+    """Оценка числа строк планировщиком или None, если её нет."""
+    querysets = getattr(object_list, 'querysets', (object_list,))
+    total = 0
+    for queryset in querysets:
+        if not isinstance(queryset, QuerySet):
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        total += int(plan[0]['Plan']['Plan Rows'])
+    return total
+
+
+class FeedPaginator(Paginator):
+    """Paginator ленты ``feed`` с кэшем и ограничением числа страниц."""
+    def __init__(self, object_list, per_page, feed=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.feed = feed
+
+    @cached_property
+    def totals(self):
+        """Пара (число постов, оценка ли это)."""
+        key = count_key(self.feed) if self.feed else None
+        totals = cache.get(key) if key else None
+        if totals is None:
+            totals = self.count_objects()
+            if key:
+                cache.set(key, totals, settings.FEED_COUNT_TIMEOUT)
+        return totals
+
+    def count_objects(self):
+        limit = settings.FEED_EXACT_COUNT_LIMIT
+        counted = bounded_count(
+            self.object_list, max(limit, self.max_count) + 1)
+        if counted <= limit:
+            return counted, False
+        estimate = estimate_count(self.object_list)
+        return max(estimate or 0, limit), True
+
+    @property
+    def total(self):
+        return self.totals[0]
+
+    @property
+    def estimated(self):
+        return self.totals[1]
+
+    @cached_property
+    def max_count(self):
+        return settings.FEED_MAX_PAGES * self.per_page
+
+    @cached_property
+    def count(self):
+        """Число постов в пределах доступных страниц."""
+        return min(self.total, self.max_count)
+
+    def get_elided_page_range(self, number, on_each_side=2, on_ends=1):
+        """Номера страниц вокруг текущей и по краям, пропуски - ELLIPSIS."""
+        number = self.validate_number(number)
+        if self.num_pages <= (on_each_side + on_ends) * 2 + 1:
+            yield from self.page_range
+            return
+        if number > 1 + on_each_side + on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < self.num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield ELLIPSIS
+            yield from range(self.num_pages - on_ends + 1, self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
@@ -0,0 +1,83 @@
+"""Проверка «есть ли что-то новое» для лент без их отрисовки.
+
+Для каждой ленты в кэше лежит отметка ``feed_mark:{feed}`` - время
+самого свежего поста (unix time). Новый пост сдвигает отметки общей
+ленты и лент подписчиков автора, поэтому ответ «ничего нового» не
+трогает таблицу постов. Число новых постов считается запросом с
+``LIMIT`` только когда отметка новее курсора клиента.
+
+Сдвиг отметки виден другим воркерам, только если кэш общий. В LocMem
+каждый воркер держит свою копию, поэтому там она живёт
+``POLL_MARK_LOCAL_TIMEOUT`` секунд и перечитывается из базы.
+"""
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.db.models import Max
+
+from core.cache import is_shared
+
+from .models import Post
+
+
+def mark_key(feed):
+    return f'feed_mark:{feed}'
+
+
+def mark_timeout():
+    if is_shared(DEFAULT_CACHE_ALIAS):
+        return settings.POLL_MARK_TIMEOUT
+    return settings.POLL_MARK_LOCAL_TIMEOUT
+
+
+def invalidate(*feeds):
+    cache.delete_many([mark_key(feed) for feed in feeds])
+
+
+def feed_posts(feed):
+    if feed == 'index':
+        return Post.objects.all()
+    user_id = int(feed.split(':', 1)[1])
+    return Post.objects.filter(author__following__user_id=user_id)
+
+
+def high_water(feed):
+    """Время самого свежего поста ленты, 0 для пустой."""
+    key = mark_key(feed)
+    mark = cache.get(key)
+    if mark is None:
+        latest = feed_posts(feed).aggregate(latest=Max('pub_date'))['latest']
+        mark = latest.timestamp() if latest else 0.0
+        cache.set(key, mark, mark_timeout())
+    return mark
+
+
+def advance(feeds, when):
+    cache.set_many(
+        {mark_key(feed): when.timestamp() for feed in feeds},
+        mark_timeout())
+
+
+def new_count(feed, since):
+    """Число постов новее since, не больше UNREAD_MAX."""
+    since = datetime.fromtimestamp(since, tz=dt_timezone.utc)
+    return feed_posts(feed).filter(pub_date__gt=since).order_by()[
+        :settings.UNREAD_MAX].count()
+
+
+def wait_for_new(feed, since, wait, sleep=time.sleep):
+    """Ждёт до wait секунд, пока отметка ленты не станет новее since.
+
+    Возвращает отметку или None, если за это время ничего не появилось.
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        mark = high_water(feed)
+        if mark > since:
+            return mark
+        left = deadline - time.monotonic()
+        if left <= 0:
+            return None
+        sleep(min(settings.POLL_CHECK_INTERVAL, left))
@@ -0,0 +1,96 @@
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import (
+    cards, group_stats, minhash, paginator, polling, trending, unread,
+    view_counter,
+)
+from .models import Follow, Post
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def drop_post_card(sender, instance, **kwargs):
+    cards.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def drop_feed_counts(sender, instance, created=True, **kwargs):
+    feeds = ['index', f'profile:{instance.author_id}']
+    if instance.group_id:
+        feeds.append(f'group:{instance.group_id}')
+    # при правке число постов в лентах подписчиков и в популярном не
+    # меняется; оценка удалённого поста уходит из популярного каскадом
+    if created:
+        feeds.append(trending.FEED)
+        followers = Follow.objects.filter(
+            author_id=instance.author_id).values_list('user_id', flat=True)
+        feeds.extend(f'follow:{user_id}' for user_id in followers)
+    paginator.invalidate_counts(*feeds)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def drop_follow_count(sender, instance, **kwargs):
+    paginator.invalidate_counts(f'follow:{instance.user_id}')
+    unread.invalidate(instance.user_id)
+    polling.invalidate(f'follow:{instance.user_id}')
+
+
+@receiver(post_save, sender=Post)
+def notify_followers(sender, instance, created, **kwargs):
+    if not created:
+        return
+    followers = list(Follow.objects.filter(
+        author_id=instance.author_id).values_list('user_id', flat=True))
+    unread.bump(followers)
+    polling.advance(
+        ['index', *(f'follow:{user_id}' for user_id in followers)],
+        instance.pub_date)
+
+
+@receiver(pre_save, sender=Post)
+def remember_saved(sender, instance, **kwargs):
+    if instance.pk is not None:
+        instance._saved_group_id, instance._saved_minhash = (
+            Post.objects.filter(pk=instance.pk).values_list(
+                'group_id', 'minhash').first() or (None, None))
+
+
+@receiver(pre_save, sender=Post)
+def set_minhash(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'text' in update_fields:
+        instance.minhash = minhash.to_db(minhash.signature(instance.text))
+
+
+@receiver(post_save, sender=Post)
+def index_minhash(sender, instance, created, **kwargs):
+    saved = getattr(instance, '_saved_minhash', None)
+    if created or instance.minhash != (saved and bytes(saved)):
+        minhash.index_post(instance.pk, instance.minhash, created)
+
+
+@receiver(post_save, sender=Post)
+def update_group_stats(sender, instance, created, **kwargs):
+    old_group_id = getattr(instance, '_saved_group_id', None)
+    if not created and old_group_id == instance.group_id:
+        return
+    if old_group_id and not created:
+        group_stats.record(old_group_id, instance.pub_date, -1)
+    if instance.group_id:
+        group_stats.record(instance.group_id, instance.pub_date, 1)
+
+
+@receiver(post_delete, sender=Post)
+def drop_group_stats(sender, instance, **kwargs):
+    if instance.group_id:
+        group_stats.record(instance.group_id, instance.pub_date, -1)
+
+
+@receiver(request_finished)
+def flush_post_views(sender, **kwargs):
+    # ответ уже отправлен, запись просмотров его не задерживает
+    if view_counter.buffer.due():
+        view_counter.buffer.flush()
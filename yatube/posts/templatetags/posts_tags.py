@@ -0,0 +1,32 @@
+from django import template
+
+from .. import cards, follow_graph
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts, show_group=False, hide_info=False):
+    """Готовые карточки страницы ленты из кэша фрагментов.
+
+    ``{% post_cards page_obj as cards %}`` и затем цикл по ``cards``.
+    """
+    return cards.render_cards(posts, show_group, hide_info)
+
+
+@register.simple_tag
+def page_window(page_obj):
+    """Номера страниц вокруг текущей, пропуски отмечены ``…``.
+
+    ``{% page_window page_obj as pages %}``
+    """
+    paginator = page_obj.paginator
+    if hasattr(paginator, 'get_elided_page_range'):
+        return list(paginator.get_elided_page_range(page_obj.number))
+    return paginator.page_range
+
+
+@register.inclusion_tag('includes/suggested_authors.html')
+def suggested_authors(user):
+    """Виджет «кого почитать» из готовых рекомендаций."""
+    return {'authors': follow_graph.get_suggested_authors(user)}
@@ -0,0 +1,62 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import ArchivedComment, ArchivedPost, Comment, Post, PostViews
+
+User = get_user_model()
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.old_post = Post.objects.create(
+            author=cls.author, text='Старый пост')
+        Comment.objects.create(
+            author=cls.author, post=cls.old_post, text='Старый комментарий')
+        # auto_now_add не даёт задать дату при создании
+        Post.objects.filter(pk=cls.old_post.pk).update(
+            pub_date=timezone.now() - timedelta(days=400))
+        Comment.objects.update(
+            created=timezone.now() - timedelta(days=400))
+        PostViews.objects.create(post=cls.old_post, views=42)
+        cls.new_post = Post.objects.create(
+            author=cls.author, text='Новый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        call_command('archive_posts', days=365, stdout=StringIO())
+
+    def test_old_posts_moved_to_archive(self):
+        """Старые посты и их комментарии переезжают в архив."""
+        self.assertFalse(Post.objects.filter(pk=self.old_post.pk).exists())
+        self.assertTrue(Post.objects.filter(pk=self.new_post.pk).exists())
+        self.assertTrue(
+            ArchivedPost.objects.filter(pk=self.old_post.pk).exists())
+        self.assertEqual(Comment.objects.count(), 0)
+        self.assertEqual(ArchivedComment.objects.count(), 1)
+
+    def test_post_detail_reads_archive(self):
+        """Страница архивного поста открывается вместе с комментариями."""
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.old_post.pk,)))
+        self.assertEqual(response.context['post'].text, self.old_post.text)
+        self.assertTrue(response.context['is_archived'])
+        self.assertEqual(len(response.context['comments']), 1)
+        self.assertEqual(response.context['views'], 42)
+
+    def test_profile_lists_hot_then_archived(self):
+        """Профиль показывает сначала горячие, затем архивные посты."""
+        response = self.client.get(
+            reverse('posts:profile', args=(self.author.username,)))
+        texts = [post.text for post in response.context['page_obj']]
+        self.assertEqual(texts, [self.new_post.text, self.old_post.text])
+        self.assertEqual(response.context['page_obj'].paginator.count, 2)
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .. import cards
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='')
+        cls.post = Post.objects.create(
+            author=cls.author, text='Первый', group=cls.group)
+        Post.objects.create(author=cls.author, text='Второй')
+
+    def setUp(self):
+        cache.clear()
+
+    def posts(self):
+        return Post.objects.select_related('author', 'group')
+
+    def render(self, posts, **flags):
+        return ''.join(cards.render_cards(posts, **flags))
+
+    def test_card_per_post(self):
+        """По карточке на пост, без разделителей внутри."""
+        fragments = cards.render_cards(self.posts(), show_group=True)
+        self.assertEqual(len(fragments), 2)
+        self.assertNotIn('<hr>', ''.join(fragments))
+        self.assertIn('/group/test-slug/', fragments[0] + fragments[1])
+
+    def test_cached_cards_not_rendered_again(self):
+        """Повторная отрисовка берёт карточки из кэша."""
+        posts = list(self.posts())
+        first = self.render(posts)
+        key = cards.card_key(self.post.pk, '00')
+        version, _ = cache.get(key)
+        cache.set(key, (version, '<article>из кэша</article>'))
+        self.assertIn('из кэша', self.render(posts))
+        self.assertNotIn('из кэша', first)
+
+    def test_post_save_drops_card(self):
+        """Сохранение поста удаляет его карточки из кэша."""
+        cards.render_cards(self.posts())
+        self.post.text = 'Исправленный'
+        self.post.save()
+        self.assertIsNone(cache.get(cards.card_key(self.post.pk, '00')))
+        self.assertIn('Исправленный', self.render(self.posts()))
+
+    def test_author_rename_changes_version(self):
+        """Смена имени автора делает карточку устаревшей."""
+        cards.render_cards(self.posts())
+        self.author.first_name = 'Новое'
+        self.author.save()
+        self.assertIn('Новое', self.render(self.posts()))
+
+    def test_no_queries_for_related_objects(self):
+        """С select_related карточки не делают своих запросов."""
+        posts = list(self.posts())
+        with CaptureQueriesContext(connection) as context:
+            cards.render_cards(posts, show_group=True)
+        self.assertEqual(context.captured_queries, [])
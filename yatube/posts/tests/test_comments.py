@@ -0,0 +1,58 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Post
+
+User = get_user_model()
+
+
+class AjaxCommentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='TestUser')
+        cls.post = Post.objects.create(author=cls.user, text='Тест')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:add_comment', args=(self.post.pk,))
+
+    def test_ajax_returns_fragment(self):
+        """AJAX-запрос получает только фрагмент нового комментария."""
+        response = self.client.post(
+            self.url, {'text': 'Новый комментарий'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 201)
+        self.assertTemplateUsed(response, 'includes/comment.html')
+        self.assertTemplateNotUsed(response, 'posts/post_detail.html')
+        self.assertContains(
+            response, 'Новый комментарий', status_code=201)
+        self.assertTrue(
+            Comment.objects.filter(text='Новый комментарий').exists())
+
+    def test_ajax_invalid_form_returns_errors(self):
+        """Ошибки формы приходят JSON со статусом 400."""
+        response = self.client.post(
+            self.url, {'text': ''}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('text', response.json()['errors'])
+        self.assertFalse(Comment.objects.exists())
+
+    def test_plain_post_redirects(self):
+        """Без JS после отправки, в том числе пустой, - редирект."""
+        detail_url = reverse('posts:post_detail', args=(self.post.pk,))
+        for text in ('Комментарий', ''):
+            with self.subTest(text=text):
+                response = self.client.post(self.url, {'text': text})
+                self.assertRedirects(response, detail_url)
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_form_marked_for_enhancement(self):
+        """Форма на странице поста подключает скрипт отправки."""
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.post.pk,)))
+        self.assertContains(response, 'data-comment-form')
+        self.assertContains(response, 'js/comments.js')
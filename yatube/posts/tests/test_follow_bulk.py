@@ -0,0 +1,80 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Follow
+
+User = get_user_model()
+
+
+class FollowBulkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader')
+        cls.authors = [
+            User.objects.create_user(username=f'author{i}')
+            for i in range(3)
+        ]
+        Follow.objects.create(user=cls.user, author=cls.authors[0])
+
+    def setUp(self):
+        caches[settings.FOLLOW_GRAPH_CACHE].clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+        self.url = reverse('posts:follow_bulk')
+
+    def post(self, data):
+        return self.client.post(
+            self.url, json.dumps(data), content_type='application/json')
+
+    def test_follow_and_unfollow(self):
+        """Подписки и отписки применяются, ответ - новое состояние."""
+        response = self.post({
+            'follow': ['author1', 'author2', 'reader', 'nobody'],
+            'unfollow': ['author0'],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'following': {
+                'author0': False, 'author1': True, 'author2': True,
+            },
+            'unknown': ['nobody', 'reader'],
+        })
+        self.assertEqual(
+            set(self.user.follower.values_list(
+                'author__username', flat=True)),
+            {'author1', 'author2'})
+
+    def test_usernames_resolved_in_one_query(self):
+        """Имена ищутся одним запросом, повторная подписка не падает."""
+        names = ['author0', 'author1', 'author2']
+        with CaptureQueriesContext(connection) as context:
+            response = self.post({'follow': names})
+        self.assertEqual(response.status_code, 200)
+        lookups = [
+            query for query in context.captured_queries
+            if 'auth_user' in query['sql'] and 'IN' in query['sql']
+        ]
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(self.user.follower.count(), 3)
+
+    def test_bad_requests(self):
+        """Неверное тело и слишком длинный список отклоняются."""
+        names = [f'user{i}' for i in range(settings.FOLLOW_BULK_LIMIT + 1)]
+        bodies = ('не json', json.dumps([]), json.dumps({'follow': 'a'}),
+                  json.dumps({'follow': names}))
+        for body in bodies:
+            with self.subTest(body=body[:20]):
+                response = self.client.post(
+                    self.url, body, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+
+    def test_get_not_allowed(self):
+        """Принимается только POST."""
+        self.assertEqual(self.client.get(self.url).status_code, 405)
@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import follow_graph
+from ..models import Follow
+
+User = get_user_model()
+
+
+class FollowGraphTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader, cls.friend, cls.other, cls.star, cls.niche = (
+            User.objects.create_user(username=name)
+            for name in ('reader', 'friend', 'other', 'star', 'niche'))
+        Follow.objects.bulk_create([
+            Follow(user=cls.reader, author=cls.friend),
+            Follow(user=cls.reader, author=cls.other),
+            Follow(user=cls.friend, author=cls.star),
+            Follow(user=cls.other, author=cls.star),
+            Follow(user=cls.other, author=cls.niche),
+            Follow(user=cls.friend, author=cls.reader),
+        ])
+
+    def setUp(self):
+        caches[settings.FOLLOW_GRAPH_CACHE].clear()
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def test_suggestions_ranked_by_common_follows(self):
+        """Друзья друзей по числу общих подписок, без себя и своих."""
+        call_command('build_suggestions', stdout=StringIO())
+        self.assertEqual(
+            follow_graph.get_suggested_authors(self.reader),
+            [self.star, self.niche])
+
+    def test_followed_author_leaves_suggestions(self):
+        """Автор, на которого подписались, пропадает из рекомендаций."""
+        call_command('build_suggestions', stdout=StringIO())
+        self.client.get(
+            reverse('posts:profile_follow', args=(self.star.username,)))
+        self.assertEqual(
+            follow_graph.get_suggested_authors(self.reader), [self.niche])
+
+    def test_widget_on_follow_and_profile(self):
+        """Виджет выводится на ленте подписок и в профиле."""
+        call_command('build_suggestions', stdout=StringIO())
+        urls = (
+            reverse('posts:follow_index'),
+            reverse('posts:profile', args=(self.friend.username,)),
+        )
+        star_url = reverse('posts:profile', args=(self.star.username,))
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, 'Кого почитать')
+                self.assertContains(response, star_url)
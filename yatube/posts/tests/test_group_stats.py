@@ -0,0 +1,91 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import group_stats
+from ..models import Group, GroupStats, Post
+
+User = get_user_model()
+
+
+class GroupStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.cats = Group.objects.create(
+            title='Коты', slug='cats', description='Про котов')
+        cls.dogs = Group.objects.create(
+            title='Собаки', slug='dogs', description='Про собак')
+
+    def setUp(self):
+        cache.clear()
+
+    def stats(self, group):
+        return {
+            item.slug: (item.posts_count, item.recent_count)
+            for item in group_stats.directory()
+        }[group.slug]
+
+    def test_stats_follow_post_changes(self):
+        """Создание, перенос и удаление поста правят сводки групп."""
+        first = Post.objects.create(
+            author=self.author, text='Первый', group=self.cats)
+        Post.objects.create(author=self.author, text='Второй', group=self.cats)
+        self.assertEqual(self.stats(self.cats), (2, 2))
+        first.group = self.dogs
+        first.save()
+        self.assertEqual(self.stats(self.cats), (1, 1))
+        self.assertEqual(self.stats(self.dogs), (1, 1))
+        first.delete()
+        self.assertEqual(self.stats(self.dogs), (0, 0))
+        self.assertIsNone(
+            GroupStats.objects.get(group=self.dogs).last_pub_date)
+
+    def test_latest_post_restored_on_delete(self):
+        """После удаления последнего поста дата берётся у предыдущего."""
+        older = Post.objects.create(
+            author=self.author, text='Старый', group=self.cats)
+        newer = Post.objects.create(
+            author=self.author, text='Новый', group=self.cats)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.cats).last_pub_date,
+            newer.pub_date)
+        newer.delete()
+        self.assertEqual(
+            GroupStats.objects.get(group=self.cats).last_pub_date,
+            older.pub_date)
+
+    def test_rebuild_counts_bulk_posts(self):
+        """Команда учитывает посты, созданные в обход сигналов."""
+        old = timezone.now() - timedelta(days=30)
+        post = Post.objects.create(
+            author=self.author, text='Старый', group=self.dogs)
+        Post.objects.filter(pk=post.pk).update(pub_date=old)
+        Post.objects.bulk_create([
+            Post(author=self.author, text='Пачка', group=self.cats),
+            Post(author=self.author, text='Пачка', group=self.cats),
+        ])
+        call_command('rebuild_group_stats', stdout=StringIO())
+        self.assertEqual(self.stats(self.cats), (2, 2))
+        self.assertEqual(self.stats(self.dogs), (1, 0))
+
+    def test_directory_is_cached(self):
+        """Каталог групп - один запрос, повторный показ идёт из кэша."""
+        Post.objects.create(author=self.author, text='Пост', group=self.cats)
+        url = reverse('posts:group_directory')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(
+            [group.slug for group in response.context['groups']],
+            ['cats', 'dogs'])
+        with self.assertNumQueries(0):
+            Client().get(url)
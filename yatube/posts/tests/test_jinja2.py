@@ -0,0 +1,103 @@
+import re
+import shutil
+import tempfile
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import engines
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Group, Post
+
+try:
+    import jinja2
+except ImportError:
+    jinja2 = None
+
+User = get_user_model()
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+def squeeze(html):
+    return re.sub(r'\s+', ' ', html).strip()
+
+
+@skipUnless(jinja2, 'Jinja2 не установлен')
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class Jinja2TemplatesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.override = override_settings(
+            TEMPLATES=[settings.JINJA2_TEMPLATES, *settings.TEMPLATES])
+        cls.override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.override.disable()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='TestAuthor', first_name='Лев', last_name='Толстой')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='')
+        cls.post = Post.objects.create(
+            author=cls.author, text='Тестовый пост', group=cls.group,
+            image=SimpleUploadedFile('small.gif', SMALL_GIF, 'image/gif'))
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.author)
+
+    def test_feed_pages_rendered_by_jinja2(self):
+        """Ленты рисуются шаблонами Jinja2 и выводят пост."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_post', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.author.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                content = response.content.decode()
+                self.assertEqual(response.status_code, 200)
+                self.assertIn('Тестовый пост', content)
+                self.assertIn('Лев Толстой', content)
+                self.assertNotIn('{{', content)
+                self.assertNotIn('{%', content)
+
+    def test_card_matches_django_template(self):
+        """Карточка Jinja2 совпадает с карточкой шаблонов Django."""
+        context = {
+            'post': self.post, 'show_group': True,
+            'hide_info': False, 'last': True,
+        }
+        jinja_html, django_html = (
+            squeeze(engine.get_template(
+                'includes/post_article.html').render(context))
+            for engine in engines.all()
+        )
+        self.assertEqual(jinja_html, django_html)
+
+    def test_index_fragment_cached(self):
+        """Тег cache кэширует ленту главной, как в шаблоне Django."""
+        self.client.get(reverse('posts:index'))
+        Post.objects.filter(pk=self.post.pk).update(text='Изменён')
+        response = self.client.get(reverse('posts:index'))
+        self.assertIn('Тестовый пост', response.content.decode())
@@ -0,0 +1,91 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import minhash
+from ..models import NearDuplicate, Post, PostMinhashBand
+
+User = get_user_model()
+
+SPAM = ('Только сегодня уникальное предложение: купите наши часы со скидкой '
+        'девяносто процентов, доставка по всей стране бесплатно')
+OTHER = ('Сегодня ходили в поход на озеро, погода была отличная, поймали '
+         'двух окуней и сварили уху на костре')
+
+
+class MinhashTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='spammer')
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin')
+
+    def test_similarity_estimates_overlap(self):
+        """Мелкие правки дают высокое сходство, другой текст - низкое."""
+        original = minhash.signature(SPAM)
+        variants = {
+            'одно слово': SPAM.replace('часы', 'очки'),
+            'регистр и знаки': SPAM.upper() + '!!!',
+        }
+        for name, text in variants.items():
+            with self.subTest(variant=name):
+                self.assertGreaterEqual(minhash.similarity(
+                    original, minhash.signature(text)), 0.7)
+        self.assertLess(
+            minhash.similarity(original, minhash.signature(OTHER)), 0.2)
+        self.assertIsNone(minhash.signature('Слишком коротко'))
+
+    def test_duplicate_found_at_create(self):
+        """Копия спама с правкой находится при создании поста."""
+        first = Post.objects.create(author=self.author, text=SPAM)
+        Post.objects.create(author=self.author, text=OTHER)
+        copy = Post.objects.create(
+            author=self.author, text=SPAM.replace('часы', 'очки'))
+        duplicate = NearDuplicate.objects.get()
+        self.assertEqual(
+            (duplicate.post, duplicate.original), (copy, first))
+        self.assertEqual(
+            PostMinhashBand.objects.count(), 3 * minhash.BANDS)
+
+    def test_edit_reindexes(self):
+        """Правка текста убирает пост из совпадений."""
+        Post.objects.create(author=self.author, text=SPAM)
+        copy = Post.objects.create(author=self.author, text=SPAM)
+        copy.text = OTHER
+        copy.save()
+        self.assertFalse(NearDuplicate.objects.exists())
+
+    def test_edited_original_stays_original(self):
+        """Правка оригинала не делает его копией более нового поста."""
+        first = Post.objects.create(author=self.author, text=SPAM)
+        copy = Post.objects.create(author=self.author, text=SPAM)
+        first.text = SPAM + ' Звоните!'
+        first.save()
+        duplicate = NearDuplicate.objects.get()
+        self.assertEqual(
+            (duplicate.post, duplicate.original), (copy, first))
+
+    def test_backfill_indexes_existing_posts(self):
+        """Команда индексирует посты, созданные в обход сигналов."""
+        Post.objects.bulk_create([
+            Post(author=self.author, text=SPAM),
+            Post(author=self.author, text=SPAM + ' Звоните!'),
+        ])
+        call_command('backfill_minhash', '--chunk-size', '1',
+                     stdout=StringIO())
+        self.assertEqual(NearDuplicate.objects.count(), 1)
+        self.assertFalse(Post.objects.filter(minhash__isnull=True).exists())
+
+    def test_admin_lists_duplicates(self):
+        """Совпадения видны в админке."""
+        Post.objects.create(author=self.author, text=SPAM)
+        Post.objects.create(author=self.author, text=SPAM)
+        client = Client()
+        client.force_login(self.admin)
+        response = client.get(
+            reverse('admin:posts_nearduplicate_changelist'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'spammer')
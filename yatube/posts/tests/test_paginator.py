@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Follow, Post
+from ..paginator import ELLIPSIS, FeedPaginator
+
+User = get_user_model()
+
+
+class FeedPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='TestAuthor')
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Пост {i}') for i in range(35))
+
+    def setUp(self):
+        cache.clear()
+
+    def paginator(self, feed=None):
+        return FeedPaginator(Post.objects.all(), 2, feed=feed)
+
+    def test_elided_page_range(self):
+        """Вокруг текущей страницы окно, остальное свёрнуто."""
+        self.assertEqual(
+            list(self.paginator().get_elided_page_range(9)),
+            [1, ELLIPSIS, 7, 8, 9, 10, 11, ELLIPSIS, 18])
+        self.assertEqual(
+            list(self.paginator().get_elided_page_range(1)),
+            [1, 2, 3, ELLIPSIS, 18])
+
+    @override_settings(FEED_MAX_PAGES=5)
+    def test_pages_capped(self):
+        """Глубже FEED_MAX_PAGES лента не листается."""
+        paginator = self.paginator()
+        self.assertEqual(paginator.num_pages, 5)
+        self.assertEqual(paginator.total, 35)
+        self.assertEqual(paginator.get_page(17).number, 5)
+
+    @override_settings(FEED_EXACT_COUNT_LIMIT=20)
+    def test_estimated_total_above_limit(self):
+        """Выше порога точный подсчёт не делается."""
+        paginator = self.paginator()
+        self.assertTrue(paginator.estimated)
+        self.assertEqual(paginator.total, 20)
+        self.assertEqual(paginator.num_pages, 10)
+
+    def test_totals_cached_per_feed(self):
+        """Число постов ленты берётся из кэша, пока его не сбросят."""
+        self.assertEqual(self.paginator('index').count, 35)
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.paginator('index').count, 35)
+        self.assertEqual(context.captured_queries, [])
+        Post.objects.create(author=self.author, text='Новый')
+        self.assertEqual(self.paginator('index').count, 36)
+
+    def test_follow_feed_dropped_on_new_post(self):
+        """Новый пост сбрасывает счётчики лент подписчиков."""
+        reader = User.objects.create_user(username='Reader')
+        Follow.objects.create(user=reader, author=self.author)
+        feed = f'follow:{reader.pk}'
+        posts = Post.objects.filter(author__following__user=reader)
+        self.assertEqual(FeedPaginator(posts, 2, feed=feed).count, 35)
+        Post.objects.create(author=self.author, text='Новый')
+        self.assertEqual(FeedPaginator(posts, 2, feed=feed).count, 36)
+
+    def test_index_renders_window(self):
+        """Главная выводит окно номеров, а не все страницы."""
+        Post.objects.bulk_create(
+            Post(author=self.author, text=f'Ещё {i}') for i in range(100))
+        response = self.client.get(reverse('posts:index'))
+        content = response.content.decode()
+        self.assertIn(ELLIPSIS, content)
+        self.assertIn('?page=3"', content)
+        self.assertNotIn('?page=5"', content)
+        self.assertIn('?page=14"', content)
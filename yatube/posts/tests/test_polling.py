@@ -0,0 +1,93 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from .. import polling
+from ..models import Follow, Post
+
+User = get_user_model()
+
+
+class PollTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.stranger = User.objects.create_user(username='stranger')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        cls.post = Post.objects.create(author=cls.author, text='Первый')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.reader)
+        self.url = reverse('posts:poll')
+        self.since = self.post.pub_date.timestamp()
+
+    def poll(self, feed, since, **params):
+        return self.client.get(
+            self.url, {'feed': feed, 'since': since, **params})
+
+    def test_nothing_new_without_post_queries(self):
+        """Без новых постов ответ 204 по отметке из кэша."""
+        self.poll('index', self.since)
+        with self.assertNumQueries(0):
+            response = self.poll('index', self.since)
+        self.assertEqual(response.status_code, 204)
+
+    def test_new_posts_counted(self):
+        """Новые посты ленты возвращаются числом и новой отметкой."""
+        self.poll('follow', self.since)
+        newer = Post.objects.create(author=self.author, text='Второй')
+        Post.objects.create(author=self.stranger, text='Чужой')
+        for feed, expected in (('index', 2), ('follow', 1)):
+            with self.subTest(feed=feed):
+                response = self.poll(feed, self.since)
+                self.assertEqual(response.json()['new'], expected)
+        self.assertEqual(
+            self.poll('follow', self.since).json()['latest'],
+            newer.pub_date.timestamp())
+
+    @override_settings(CACHE_SINGLE_PROCESS=False)
+    def test_local_mark_expires(self):
+        """В LocMem отметка живёт секунды: посты других воркеров видны."""
+        self.poll('index', self.since)
+        # пост сохранил другой воркер: здешняя отметка не сдвинулась
+        Post.objects.bulk_create([Post(author=self.author, text='Второй')])
+        self.assertEqual(self.poll('index', self.since).status_code, 204)
+        later = time.time() + settings.POLL_MARK_LOCAL_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time',
+                        return_value=later):
+            response = self.poll('index', self.since)
+        self.assertEqual(response.json()['new'], 1)
+
+    def test_bad_params_rejected(self):
+        """Неизвестная лента и нечисловые курсоры дают 400."""
+        for params in (
+            {'feed': 'group', 'since': 0},
+            {'feed': 'index', 'since': 'nan'},
+            {'feed': 'index', 'since': 0, 'wait': 'inf'},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+        response = Client().get(self.url, {'feed': 'follow', 'since': 0})
+        self.assertEqual(response.status_code, 403)
+
+    def test_long_poll_returns_on_new_post(self):
+        """Ожидание заканчивается, как только появился новый пост."""
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            Post.objects.create(author=self.author, text='Пока ждали')
+
+        mark = polling.wait_for_new('index', self.since, 10, sleep=sleep)
+        self.assertEqual(len(sleeps), 1)
+        self.assertGreater(mark, self.since)
+        self.assertIsNone(polling.wait_for_new('index', mark, 0))
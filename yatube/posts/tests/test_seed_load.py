@@ -0,0 +1,59 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class SeedLoadTests(TestCase):
+    def seed(self):
+        call_command(
+            'seed_load', users=30, groups=3, posts=100, comments=50,
+            follows=60, seed=7, stdout=StringIO(),
+        )
+        return list(Post.objects.order_by('pk').values_list(
+            'text', 'author__username', 'pub_date'))
+
+    def test_creates_requested_volumes(self):
+        """Команда создаёт заданное число записей каждого типа."""
+        self.seed()
+        counts = {
+            User: 30, Group: 3, Post: 100, Comment: 50, Follow: 60,
+        }
+        for model, expected in counts.items():
+            with self.subTest(model=model.__name__):
+                self.assertEqual(model.objects.count(), expected)
+        self.assertFalse(Follow.objects.filter(
+            user_id=F('author_id')).exists())
+
+    def test_same_seed_gives_same_data(self):
+        """Один и тот же seed даёт одинаковые тексты и авторов."""
+        first = self.seed()
+        for model in (Follow, Comment, Post, Group, User):
+            model.objects.all().delete()
+        second = self.seed()
+        self.assertEqual(
+            [row[:2] for row in first], [row[:2] for row in second])
+
+    def test_generated_dates_kept(self):
+        """Даты постов и комментариев - сгенерированные, а не текущие."""
+        self.seed()
+        day_ago = timezone.now() - timedelta(days=1)
+        self.assertTrue(Post.objects.filter(pub_date__lt=day_ago).exists())
+        self.assertTrue(
+            Comment.objects.filter(created__lt=day_ago).exists())
+
+    def test_follows_capped_by_pairs(self):
+        """Подписок не больше, чем пар пользователей, и команда не виснет."""
+        call_command(
+            'seed_load', users=5, groups=1, posts=5, comments=0,
+            follows=100, stdout=StringIO(),
+        )
+        self.assertEqual(Follow.objects.count(), 5 * 4)
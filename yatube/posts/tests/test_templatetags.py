@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import TestCase
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class PostCardsTagTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='')
+        Post.objects.create(author=cls.author, text='Первый', group=cls.group)
+        Post.objects.create(author=cls.author, text='Второй')
+
+    def setUp(self):
+        cache.clear()
+
+    def render(self, **context):
+        return Template(
+            '{% load posts_tags %}'
+            '{% post_cards posts show_group=show_group as cards %}'
+            '{% for card in cards %}{{ card }}'
+            '{% if not forloop.last %}<hr>{% endif %}{% endfor %}'
+        ).render(Context({'posts': Post.objects.all(), **context}))
+
+    def test_cards_separated_by_rule(self):
+        """Карточки разделены линией, после последней её нет."""
+        html = self.render(show_group=False)
+        self.assertEqual(html.count('<article>'), 2)
+        self.assertEqual(html.count('<hr>'), 1)
+
+    def test_group_link_optional(self):
+        """Ссылка на группу выводится только с show_group."""
+        self.assertNotIn('/group/test-slug/', self.render(show_group=False))
+        self.assertIn('/group/test-slug/', self.render(show_group=True))
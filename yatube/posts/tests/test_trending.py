@@ -0,0 +1,107 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import trending
+from ..models import Comment, Post, PostScore
+
+User = get_user_model()
+
+
+@override_settings(RATELIMIT_ENABLED=False)
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.quiet = Post.objects.create(author=cls.author, text='Тихий пост')
+        cls.busy = Post.objects.create(
+            author=cls.author, text='Обсуждаемый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.author)
+
+    def test_decay_matches_direct_sum(self):
+        """Накопленный рейтинг равен сумме весов с затуханием."""
+        now = timezone.now()
+        half_life = timedelta(seconds=settings.TRENDING_HALF_LIFE)
+        events = [(1.0, now - 2 * half_life), (2.0, now - half_life),
+                  (1.0, now)]
+        for weight, when in events:
+            trending.bump(self.quiet.pk, weight, when)
+        score = PostScore.objects.get(post=self.quiet).score
+        self.assertAlmostEqual(
+            trending.current(score, now), 0.25 + 1.0 + 1.0)
+
+    def test_comments_raise_post_in_trending(self):
+        """Комментарии поднимают пост в ленте популярного."""
+        trending.bump(self.quiet.pk, 1.0)
+        for text in ('Первый', 'Второй'):
+            self.client.post(
+                reverse('posts:add_comment', args=(self.busy.pk,)),
+                {'text': text})
+        response = self.client.get(reverse('posts:trending'))
+        self.assertEqual(
+            list(response.context['page_obj']), [self.busy, self.quiet])
+
+    def test_failed_bump_rolls_back(self):
+        """Пост и комментарий не сохраняются без своего рейтинга."""
+        requests = (
+            (reverse('posts:post_create'), {'text': 'Новый пост'}),
+            (reverse('posts:add_comment', args=(self.busy.pk,)),
+             {'text': 'Комментарий'}),
+        )
+        for url, data in requests:
+            with self.subTest(url=url):
+                with mock.patch.object(
+                        trending, 'bump', side_effect=DatabaseError):
+                    with self.assertRaises(DatabaseError):
+                        self.client.post(url, data)
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertFalse(Comment.objects.exists())
+
+    def test_deleted_post_leaves_trending_count(self):
+        """Удаление поста сбрасывает закэшированное число постов ленты."""
+        post = Post.objects.create(author=self.author, text='Удаляемый')
+        trending.bump(post.pk, 1.0)
+        url = reverse('posts:trending')
+        self.assertEqual(
+            self.client.get(url).context['page_obj'].paginator.count, 1)
+        post.delete()
+        self.assertEqual(
+            self.client.get(url).context['page_obj'].paginator.count, 0)
+
+    def test_recent_post_outranks_old_activity(self):
+        """Свежий пост выше поста с давними комментариями."""
+        old = timezone.now() - timedelta(days=3)
+        for _ in range(5):
+            trending.bump(self.busy.pk, 1.0, old)
+        self.client.post(reverse('posts:post_create'), {'text': 'Новый'})
+        new_post = Post.objects.get(text='Новый')
+        self.assertEqual(
+            list(trending.top()), [new_post, self.busy])
+
+    def test_compact_drops_stale_scores(self):
+        """Команда удаляет затухшие рейтинги и может пересчитать их."""
+        trending.bump(self.quiet.pk, 1.0, timezone.now() - timedelta(days=30))
+        trending.bump(self.busy.pk, 1.0)
+        call_command('compact_trending', stdout=StringIO())
+        self.assertEqual(
+            list(PostScore.objects.values_list('post_id', flat=True)),
+            [self.busy.pk])
+        Comment.objects.create(
+            post=self.quiet, author=self.author, text='Свежий')
+        call_command('compact_trending', '--rebuild', stdout=StringIO())
+        self.assertEqual(
+            set(PostScore.objects.values_list('post_id', flat=True)),
+            {self.quiet.pk, self.busy.pk})
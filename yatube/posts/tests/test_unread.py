@@ -0,0 +1,94 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import unread
+from ..models import Follow, Post
+
+User = get_user_model()
+
+
+class UnreadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def publish(self, count):
+        for number in range(count):
+            Post.objects.create(author=self.author, text=f'Пост {number}')
+
+    def test_new_posts_bump_cached_counter(self):
+        """Новые посты увеличивают счётчик, просмотр ленты его сбрасывает."""
+        self.client.get(reverse('posts:follow_index'))
+        self.publish(2)
+        self.assertEqual(cache.get(unread.unread_key(self.reader.pk)), 2)
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(response.context['new_on_page'], 2)
+        self.assertEqual(unread.get_unread(self.reader.pk), 0)
+
+    def test_feed_view_writes_only_when_cursor_moves(self):
+        """Просмотр ленты без новых постов не пишет курсор в базу."""
+        url = reverse('posts:follow_index')
+        self.client.get(url)
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+        self.assertFalse([
+            query for query in context.captured_queries
+            if 'followfeedcursor' in query['sql']
+            and not query['sql'].startswith('SELECT')
+        ])
+        self.publish(1)
+        self.assertEqual(self.client.get(url).context['new_on_page'], 1)
+        self.assertEqual(self.client.get(url).context['new_on_page'], 0)
+
+    def test_header_costs_one_cache_hit(self):
+        """Шапка берёт счётчик из кэша, без запросов к базе."""
+        self.client.get(reverse('posts:follow_index'))
+        self.publish(3)
+        url = reverse('about:author')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.context['unread_count'], 3)
+        self.assertContains(response, '<span class="badge bg-danger">3</span>')
+
+    def test_lost_counter_recounted(self):
+        """Пропавший из кэша счётчик пересчитывается по курсору."""
+        self.client.get(reverse('posts:follow_index'))
+        cache.clear()
+        self.publish(2)
+        self.assertEqual(unread.get_unread(self.reader.pk), 2)
+
+    @override_settings(CACHE_SINGLE_PROCESS=False)
+    def test_local_counter_expires(self):
+        """В LocMem счётчик живёт секунды: посты других воркеров видны."""
+        self.client.get(reverse('posts:follow_index'))
+        # пост сохранил другой воркер: здешний счётчик не увеличился
+        Post.objects.bulk_create([Post(author=self.author, text='Чужой')])
+        self.assertEqual(unread.get_unread(self.reader.pk), 0)
+        later = time.time() + settings.UNREAD_LOCAL_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time',
+                        return_value=later):
+            self.assertEqual(unread.get_unread(self.reader.pk), 1)
+
+    def test_unfollow_drops_counter(self):
+        """Отписка сбрасывает счётчик непрочитанного."""
+        self.client.get(reverse('posts:follow_index'))
+        self.publish(1)
+        Follow.objects.filter(user=self.reader).delete()
+        self.assertEqual(unread.get_unread(self.reader.pk), 0)
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import view_counter
+from ..models import Post, PostViews
+
+User = get_user_model()
+
+
+@override_settings(POST_VIEWS_FLUSH_SIZE=3, POST_VIEWS_FLUSH_INTERVAL=3600)
+class ViewCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='TestAuthor')
+        cls.post = Post.objects.create(author=cls.author, text='Тест')
+        cls.other = Post.objects.create(author=cls.author, text='Другой')
+
+    def setUp(self):
+        view_counter.buffer.take()
+        self.url = reverse('posts:post_detail', args=(self.post.pk,))
+
+    def test_views_buffered_until_threshold(self):
+        """Просмотры пишутся в базу только по достижении порога."""
+        for expected in (1, 2):
+            with self.subTest(views=expected):
+                response = self.client.get(self.url)
+                self.assertEqual(response.context['views'], expected)
+                self.assertFalse(PostViews.objects.exists())
+        self.client.get(self.url)
+        self.assertEqual(PostViews.objects.get(post=self.post).views, 3)
+        self.assertEqual(view_counter.buffer.pending(self.post.pk), 0)
+
+    def test_flush_groups_equal_deltas(self):
+        """Посты с одинаковой дельтой обновляются одним UPDATE."""
+        for post in (self.post, self.other):
+            view_counter.buffer.hit(post.pk)
+            view_counter.buffer.hit(post.pk)
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(view_counter.buffer.flush(), 4)
+        updates = [query for query in context.captured_queries
+                   if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            dict(PostViews.objects.values_list('post_id', 'views')),
+            {self.post.pk: 2, self.other.pk: 2})
+
+    def test_deleted_post_skipped(self):
+        """Просмотры удалённого поста отбрасываются при записи."""
+        post = Post.objects.create(author=self.author, text='Удалённый')
+        view_counter.buffer.hit(post.pk)
+        post.delete()
+        view_counter.buffer.flush()
+        self.assertFalse(PostViews.objects.exists())
+
+    def test_idle_worker_flushed_by_timer(self):
+        """Первый просмотр заводит таймер, он пишет буфер без запросов."""
+        view_counter.buffer.hit(self.post.pk)
+        timer = view_counter.buffer._timer
+        self.assertEqual(timer.interval, 3600)
+        with mock.patch.object(view_counter.connections, 'close_all'):
+            timer.function()
+        self.assertEqual(PostViews.objects.get(post=self.post).views, 1)
+        self.assertIsNone(view_counter.buffer._timer)
+
+    def test_other_database_not_written(self):
+        """Просмотры не пишутся в другую базу, например после тестов."""
+        view_counter.buffer.hit(self.post.pk)
+        with mock.patch.object(
+                view_counter, 'database_name', return_value='other'):
+            self.assertEqual(view_counter.buffer.flush(), 0)
+        self.assertFalse(PostViews.objects.exists())
@@ -4,7 +4,7 @@ import tempfile
 from django.contrib.auth import get_user_model
 from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from django import forms
 from django.core.cache import cache
@@ -16,6 +16,7 @@ User = get_user_model()
 MAX_POSTS_ON_PAGE = 10
 
 
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
 class PostsTests(TestCase):
     @classmethod
     def setUpClass(cls):
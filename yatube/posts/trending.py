@@ -0,0 +1,113 @@
+"""Лента популярного: посты по скорости комментариев с учётом свежести.
+
+Событие весом ``w`` (новый пост, комментарий) в момент ``t`` к моменту
+``now`` весит ``w * 2 ** -((now - t) / TRENDING_HALF_LIFE)``. В
+``PostScore`` хранится логарифм суммы весов, отнесённой к общей эпохе:
+
+    score = log2(sum(w_i * 2 ** ((t_i - EPOCH) / TRENDING_HALF_LIFE)))
+
+Время уменьшает веса всех постов в одно и то же число раз, поэтому
+порядок по ``score`` совпадает с порядком по текущему рейтингу: старые
+строки не пересчитываются, новое событие лишь добавляется к сумме, а
+топ читается по индексу на ``score``. Строки постов, рейтинг которых
+затух ниже ``TRENDING_MIN_SCORE``, удаляет команда ``compact_trending``.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Comment, Post, PostScore
+from .paginator import invalidate_counts
+
+EPOCH = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+FEED = 'trending'
+
+
+def offset(when):
+    """Сколько периодов полураспада прошло от эпохи до when."""
+    seconds = (when - EPOCH).total_seconds()
+    return seconds / settings.TRENDING_HALF_LIFE
+
+
+def event_score(weight, when):
+    return math.log2(weight) + offset(when)
+
+
+def combine(first, second):
+    """log2(2 ** first + 2 ** second) без переполнения."""
+    high, low = max(first, second), min(first, second)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def current(score, now=None):
+    """Рейтинг к моменту now: сумма весов событий с затуханием."""
+    return 2 ** (score - offset(now or timezone.now()))
+
+
+def bump(post_id, weight, when=None):
+    """Добавляет к рейтингу поста событие весом weight."""
+    value = event_score(weight, when or timezone.now())
+    with transaction.atomic():
+        row, created = PostScore.objects.select_for_update().get_or_create(
+            post_id=post_id, defaults={'score': value})
+        if not created:
+            row.score = combine(row.score, value)
+            row.save(update_fields=['score'])
+    if created:
+        invalidate_counts(FEED)
+
+
+def top():
+    """Посты по убыванию рейтинга, путь чтения идёт по индексу score."""
+    return Post.objects.filter(score__isnull=False).select_related(
+        'author', 'group').order_by('-score__score', '-pk')
+
+
+def compact(now=None, batch_size=1000):
+    """Удаляет затухшие рейтинги пачками, возвращает их число."""
+    floor = math.log2(settings.TRENDING_MIN_SCORE) + offset(
+        now or timezone.now())
+    stale = PostScore.objects.filter(score__lt=floor)
+    removed = 0
+    while True:
+        ids = list(stale.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        removed += PostScore.objects.filter(pk__in=ids).delete()[0]
+    if removed:
+        invalidate_counts(FEED)
+    return removed
+
+
+def rebuild(since, batch_size=1000):
+    """Пересчитывает рейтинги по постам и комментариям начиная с since.
+
+    Нужен при первом включении ленты и после сбоев; в обычной работе
+    рейтинги обновляют ``bump`` из views.
+    """
+    scores = defaultdict(list)
+    posts = Post.objects.filter(pub_date__gte=since).values_list(
+        'pk', 'pub_date')
+    for post_id, pub_date in posts.iterator():
+        scores[post_id].append(
+            event_score(settings.TRENDING_POST_WEIGHT, pub_date))
+    comments = Comment.objects.filter(created__gte=since).values_list(
+        'post_id', 'created')
+    for post_id, created in comments.iterator():
+        scores[post_id].append(
+            event_score(settings.TRENDING_COMMENT_WEIGHT, created))
+    rows = []
+    for post_id, values in scores.items():
+        total = values[0]
+        for value in values[1:]:
+            total = combine(total, value)
+        rows.append(PostScore(post_id=post_id, score=total))
+    with transaction.atomic():
+        PostScore.objects.all().delete()
+        PostScore.objects.bulk_create(rows, batch_size=batch_size)
+    invalidate_counts(FEED)
+    return len(rows)
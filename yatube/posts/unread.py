@@ -0,0 +1,83 @@
+"""Непрочитанные посты ленты подписок.
+
+Курсор ``FollowFeedCursor`` хранит время последнего просмотра
+``follow_index``, а кэш - число новых постов после него под ключом
+``unread:{id}``. Новый пост увеличивает счётчики подписчиков, которые
+уже есть в кэше; пропавший счётчик пересчитывается одним запросом с
+``LIMIT UNREAD_MAX``. Шапка берёт счётчик из контекстного процессора
+``core.context_processors.unread`` - одно обращение к кэшу.
+
+Счётчик в LocMem увеличивает только воркер, сохранивший пост, поэтому
+там он живёт ``UNREAD_LOCAL_TIMEOUT`` секунд и пересчитывается из базы.
+"""
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.utils import timezone
+
+from core.cache import is_shared
+
+from . import polling
+from .models import FollowFeedCursor, Post
+
+
+def unread_key(user_id):
+    return f'unread:{user_id}'
+
+
+def unread_timeout():
+    if is_shared(DEFAULT_CACHE_ALIAS):
+        return settings.UNREAD_TIMEOUT
+    return settings.UNREAD_LOCAL_TIMEOUT
+
+
+def invalidate(*user_ids):
+    cache.delete_many([unread_key(user_id) for user_id in user_ids])
+
+
+def last_seen(user_id):
+    return FollowFeedCursor.objects.filter(user_id=user_id).values_list(
+        'last_seen', flat=True).first()
+
+
+def count_unread(user_id):
+    """Новые посты авторов из подписок, не больше UNREAD_MAX."""
+    posts = Post.objects.filter(author__following__user_id=user_id)
+    seen = last_seen(user_id)
+    if seen is not None:
+        posts = posts.filter(pub_date__gt=seen)
+    return posts.order_by()[:settings.UNREAD_MAX].count()
+
+
+def get_unread(user_id):
+    key = unread_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = count_unread(user_id)
+        cache.set(key, count, unread_timeout())
+    return min(count, settings.UNREAD_MAX)
+
+
+def mark_seen(user_id):
+    """Сдвигает курсор на текущий момент, возвращает прежний.
+
+    В базу пишется, только если в ленте есть посты новее курсора: запись
+    закрепляет клиента за основной базой (см. core/db/routers.py), а
+    свежесть ленты берётся из отметки ``polling.high_water``.
+    """
+    seen = last_seen(user_id)
+    latest = polling.high_water(f'follow:{user_id}')
+    if seen is None or latest > seen.timestamp():
+        FollowFeedCursor.objects.update_or_create(
+            user_id=user_id, defaults={'last_seen': timezone.now()})
+    cache.set(unread_key(user_id), 0, unread_timeout())
+    return seen
+
+
+def bump(user_ids):
+    """Новый пост: +1 к счётчикам подписчиков, которые есть в кэше."""
+    for user_id in user_ids:
+        try:
+            cache.incr(unread_key(user_id))
+        except ValueError:
+            # счётчика нет в кэше, его пересчитает get_unread
+            pass
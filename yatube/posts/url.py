@@ -5,6 +5,8 @@ app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('trending/', views.trending_index, name='trending'),
+    path('group/', views.group_directory, name='group_directory'),
     path('group/<slug:slug>/', views.group_posts, name='group_post'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
@@ -14,6 +16,8 @@ urlpatterns = [
         'posts/<int:post_id>/comment/', views.add_comment, name='add_comment'
     ),
     path('follow/', views.follow_index, name='follow_index'),
+    path('poll/', views.poll, name='poll'),
+    path('follow/bulk/', views.follow_bulk, name='follow_bulk'),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
@@ -0,0 +1,132 @@
+"""Счётчик просмотров постов с отложенной записью.
+
+Просмотр лишь увеличивает счётчик в памяти процесса. Накопленные дельты
+пишутся в ``PostViews`` одной транзакцией, когда набралось
+``POST_VIEWS_FLUSH_SIZE`` просмотров или прошло
+``POST_VIEWS_FLUSH_INTERVAL`` секунд. Запись идёт по сигналу
+``request_finished``, то есть уже после отправки ответа, поэтому
+запрос на ней не ждёт. Простаивающий воркер сбрасывает буфер по
+таймеру через ``POST_VIEWS_FLUSH_INTERVAL`` секунд после первого
+несброшенного просмотра, завершающийся - при выходе (``atexit``). При
+падении воркера теряется не больше одной несброшенной пачки; при ошибке
+базы дельты возвращаются в буфер.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+
+from .models import Post, PostViews
+
+logger = logging.getLogger('yatube.view_counter')
+
+
+class ViewBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._hits = 0
+        self._flushed_at = time.monotonic()
+        self._timer = None
+        # база, на которой набраны просмотры: к выходу тестов она уже
+        # другая, и писать в неё нечего
+        self._database = None
+
+    def hit(self, post_id):
+        with self._lock:
+            self._pending[post_id] += 1
+            self._hits += 1
+            self._arm()
+
+    def _arm(self):
+        if self._timer is None:
+            self._database = database_name()
+            self._timer = threading.Timer(
+                settings.POST_VIEWS_FLUSH_INTERVAL, self.flush_idle)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def pending(self, post_id):
+        with self._lock:
+            return self._pending.get(post_id, 0)
+
+    def due(self):
+        return (
+            self._hits >= settings.POST_VIEWS_FLUSH_SIZE
+            or time.monotonic() - self._flushed_at
+            >= settings.POST_VIEWS_FLUSH_INTERVAL
+        )
+
+    def take(self):
+        with self._lock:
+            batch, self._pending = self._pending, Counter()
+            self._hits = 0
+            self._flushed_at = time.monotonic()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return batch
+
+    def restore(self, batch):
+        with self._lock:
+            self._pending.update(batch)
+            self._hits += sum(batch.values())
+            self._arm()
+
+    def flush(self):
+        """Пишет накопленное в базу, возвращает число просмотров."""
+        database = self._database
+        batch = self.take()
+        if not batch or database != database_name():
+            return 0
+        try:
+            write(batch)
+        except DatabaseError:
+            self.restore(batch)
+            logger.exception('Не удалось записать просмотры постов')
+            return 0
+        return sum(batch.values())
+
+    def flush_idle(self):
+        """Сброс по таймеру, в своём потоке и со своим соединением."""
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+
+def database_name():
+    return connections['default'].settings_dict['NAME']
+
+
+def write(batch):
+    """Прибавляет дельты; одна команда UPDATE на каждое значение дельты."""
+    # пост могли удалить, пока его просмотры лежали в буфере
+    existing = Post.objects.filter(pk__in=batch).values_list('pk', flat=True)
+    by_delta = defaultdict(list)
+    for post_id in existing:
+        by_delta[batch[post_id]].append(post_id)
+    with transaction.atomic():
+        PostViews.objects.bulk_create(
+            [PostViews(post_id=post_id)
+             for ids in by_delta.values() for post_id in ids],
+            ignore_conflicts=True)
+        for delta, ids in by_delta.items():
+            PostViews.objects.filter(post_id__in=ids).update(
+                views=F('views') + delta)
+
+
+def count(post_id):
+    """Просмотры из базы вместе с ещё не записанными."""
+    stored = PostViews.objects.filter(post_id=post_id).values_list(
+        'views', flat=True).first()
+    return (stored or 0) + buffer.pending(post_id)
+
+
+buffer = ViewBuffer()
+atexit.register(buffer.flush)
@@ -1,19 +1,33 @@
+import json
+import math
+from http import HTTPStatus
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.views.decorators.http import require_GET, require_POST
+
+from core.ratelimit import ratelimit
 
 from .models import Post
 from .models import Group
 from .models import Follow
 from .forms import PostForm, CommentForm
+from . import (
+    archive, group_stats, polling, trending, unread,
+    view_counter,
+)
+from .paginator import FeedPaginator, invalidate_counts
 
 
-def get_page(request, post_list):
+def get_page(request, post_list, feed):
     POSTS_AMOUNT = 10
-    paginator = Paginator(post_list, POSTS_AMOUNT)
+    paginator = FeedPaginator(post_list, POSTS_AMOUNT, feed=feed)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
@@ -21,19 +35,37 @@ def get_page(request, post_list):
 
 def index(request):
     template = 'posts/index.html'
-    post_list = Post.objects.all()
-    page_obj = get_page(request, post_list)
+    post_list = Post.objects.select_related('author', 'group')
+    page_obj = get_page(request, post_list, 'index')
     context = {
         'page_obj': page_obj,
     }
     return render(request, template, context)
 
 
+def trending_index(request):
+    template = 'posts/trending.html'
+    page_obj = get_page(request, trending.top(), trending.FEED)
+    context = {
+        'page_obj': page_obj,
+    }
+    return render(request, template, context)
+
+
+def group_directory(request):
+    template = 'posts/groups.html'
+    context = {
+        'groups': group_stats.directory(),
+        'recent_days': settings.GROUP_RECENT_DAYS,
+    }
+    return render(request, template, context)
+
+
 def group_posts(request, slug):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
-    page_obj = get_page(request, post_list)
+    post_list = group.posts.select_related('author', 'group')
+    page_obj = get_page(request, post_list, f'group:{group.pk}')
     context = {
         'group': group,
         'page_obj': page_obj,
@@ -46,10 +78,10 @@ def profile(request, username):
     current_user = None
     if request.user.is_authenticated:
         current_user = request.user
-    post_list = user.posts.all()
+    post_list = archive.author_posts(user)
     following = current_user and Follow.objects.filter(
         author=user, user=current_user).exists()
-    page_obj = get_page(request, post_list)
+    page_obj = get_page(request, post_list, f'profile:{user.pk}')
     context = {
         'author': user,
         'page_obj': page_obj,
@@ -59,24 +91,36 @@ def profile(request, username):
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post, is_archived = archive.get_post_or_404(post_id)
     form = CommentForm()
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
+    if is_archived:
+        views = post.views
+    else:
+        view_counter.buffer.hit(post.pk)
+        views = view_counter.count(post.pk)
     context = {
         'post': post,
         'comments': comments,
         'form': form,
+        'is_archived': is_archived,
+        'views': views,
     }
     return render(request, 'posts/post_detail.html', context)
 
 
 @login_required
+@ratelimit('post_create')
 def post_create(request):
     form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
-        post.save()
+        # пост без рейтинга не попал бы в ленту популярного
+        with transaction.atomic():
+            post.save()
+            trending.bump(
+                post.pk, settings.TRENDING_POST_WEIGHT, post.pub_date)
         return redirect('posts:profile', request.user)
     context = {
         'form': form,
@@ -90,10 +134,13 @@ def post_edit(request, post_id):
     is_edit = True
     if post.author != request.user:
         return redirect('posts:post_detail', post_id)
+    old_group_id = post.group_id
     form = PostForm(request.POST or None, files=request.FILES or None,
                     instance=post)
     if form.is_valid():
         post = form.save()
+        if old_group_id and old_group_id != post.group_id:
+            invalidate_counts(f'group:{old_group_id}')
         return redirect('posts:post_detail', post_id)
     context = {
         'form': form,
@@ -104,6 +151,7 @@ def post_edit(request, post_id):
 
 
 @login_required
+@ratelimit('add_comment')
 def add_comment(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     form = CommentForm(request.POST or None)
@@ -111,23 +159,42 @@ def add_comment(request, post_id):
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
-        comment.save()
-        return redirect('posts:post_detail', post_id=post_id)
+        with transaction.atomic():
+            comment.save()
+            trending.bump(
+                post.pk, settings.TRENDING_COMMENT_WEIGHT, comment.created)
+        if request.is_ajax():
+            # только новый комментарий, без повторной отрисовки поста
+            return render(request, 'includes/comment.html', {
+                'comment': comment,
+            }, status=HTTPStatus.CREATED)
+    elif request.is_ajax():
+        return JsonResponse(
+            {'errors': form.errors.get_json_data()},
+            status=HTTPStatus.BAD_REQUEST)
+    return redirect('posts:post_detail', post_id=post_id)
 
 
 @login_required
 def follow_index(request):
     template = 'posts/follow.html'
     user = request.user
-    post_list = Post.objects.filter(author__following__user=user)
-    page_obj = get_page(request, post_list)
+    post_list = Post.objects.filter(
+        author__following__user=user).select_related('author', 'group')
+    page_obj = get_page(request, post_list, f'follow:{user.pk}')
+    last_seen = unread.mark_seen(user.pk)
+    # лента по убыванию даты: новые посты страницы идут первыми
+    new_on_page = sum(
+        post.pub_date > last_seen for post in page_obj) if last_seen else 0
     context = {
         'page_obj': page_obj,
+        'new_on_page': new_on_page,
     }
     return render(request, template, context)
 
 
 @login_required
+@ratelimit('follow', methods=('GET', 'POST'))
 def profile_follow(request, username):
     user = request.user
     author = get_object_or_404(User, username=username)
@@ -140,9 +207,114 @@ def profile_follow(request, username):
 
 
 @login_required
+@ratelimit('follow', methods=('GET', 'POST'))
 def profile_unfollow(request, username):
     user = request.user
     author = get_object_or_404(User, username=username)
     if user != author:
         Follow.objects.filter(user=user, author=author).delete()
     return redirect('posts:follow_index')
+
+
+def parse_usernames(body):
+    """Списки follow и unfollow из JSON тела запроса."""
+    data = json.loads(body)
+    follow = data.get('follow', [])
+    unfollow = data.get('unfollow', [])
+    if not all(
+        isinstance(names, list) and all(isinstance(n, str) for n in names)
+        for names in (follow, unfollow)
+    ):
+        raise ValueError('Ожидаются списки имён пользователей')
+    return set(follow), set(unfollow)
+
+
+@login_required
+@require_POST
+@ratelimit('follow')
+def follow_bulk(request):
+    """Подписка и отписка от многих авторов за один запрос.
+
+    Тело - JSON ``{"follow": [...], "unfollow": [...]}``, ответ -
+    состояние подписки на каждого из переданных авторов.
+    """
+    try:
+        follow, unfollow = parse_usernames(request.body)
+    except (ValueError, AttributeError):
+        return JsonResponse(
+            {'error': 'Ожидается JSON со списками follow и unfollow'},
+            status=400)
+    names = follow | unfollow
+    if len(names) > settings.FOLLOW_BULK_LIMIT:
+        return JsonResponse(
+            {'error': f'Не больше {settings.FOLLOW_BULK_LIMIT} имён'},
+            status=400)
+    user = request.user
+    authors = dict(User.objects.filter(username__in=names).exclude(
+        pk=user.pk).values_list('username', 'pk'))
+    # имя в обоих списках - отписка
+    to_follow = [authors[n] for n in follow - unfollow if n in authors]
+    to_unfollow = [authors[n] for n in unfollow if n in authors]
+    if to_follow:
+        Follow.objects.bulk_create(
+            [Follow(user=user, author_id=pk) for pk in to_follow],
+            ignore_conflicts=True)
+    if to_unfollow:
+        Follow.objects.filter(
+            user=user, author_id__in=to_unfollow).delete()
+    if to_follow or to_unfollow:
+        invalidate_counts(f'follow:{user.pk}')
+        unread.invalidate(user.pk)
+        polling.invalidate(f'follow:{user.pk}')
+    # состояние - из таблицы подписок
+    following = set(Follow.objects.filter(
+        user=user, author_id__in=authors.values()).values_list(
+        'author_id', flat=True))
+    return JsonResponse({
+        'following': {
+            name: pk in following for name, pk in sorted(authors.items())
+        },
+        'unknown': sorted(names - set(authors)),
+    })
+
+
+def parse_poll(params):
+    """Курсор since и время ожидания wait из параметров запроса."""
+    since = float(params['since'])
+    wait = float(params.get('wait', 0))
+    if not (math.isfinite(since) and math.isfinite(wait)):
+        raise ValueError('Ожидаются конечные числа')
+    return max(since, 0.0), min(max(wait, 0.0), settings.POLL_MAX_WAIT)
+
+
+@require_GET
+def poll(request):
+    """Есть ли в ленте посты новее курсора ``since`` (unix time).
+
+    ``feed`` - index или follow, ``wait`` - сколько секунд ждать новых
+    постов (long polling, не больше ``POLL_MAX_WAIT``). Ответ 204, если
+    нового нет, иначе ``{"new": N, "latest": T}``; T - следующий since.
+    """
+    feed = request.GET.get('feed', 'index')
+    if feed == 'follow':
+        if not request.user.is_authenticated:
+            return JsonResponse(
+                {'error': 'Лента подписок доступна после входа'},
+                status=HTTPStatus.FORBIDDEN)
+        feed = f'follow:{request.user.pk}'
+    elif feed != 'index':
+        return JsonResponse(
+            {'error': 'Лента может быть index или follow'},
+            status=HTTPStatus.BAD_REQUEST)
+    try:
+        since, wait = parse_poll(request.GET)
+    except (KeyError, ValueError):
+        return JsonResponse(
+            {'error': 'Ожидаются числа since и wait'},
+            status=HTTPStatus.BAD_REQUEST)
+    mark = polling.wait_for_new(feed, since, wait)
+    # отметка могла остаться от удалённого поста - тогда нового нет
+    count = polling.new_count(feed, since) if mark else 0
+    if not count:
+        return HttpResponse(status=HTTPStatus.NO_CONTENT)
+    return JsonResponse({'new': count, 'latest': mark})
@@ -0,0 +1,70 @@
+// Отправка комментария без перезагрузки страницы. Сервер отвечает
+// фрагментом нового комментария или JSON с ошибками формы. Редирект
+// (например, на вход) открывается как обычная страница, остальные ответы
+// показываются сообщением под формой: повторная отправка создала бы
+// второй комментарий. Обычным способом форма уходит только при сетевой
+// ошибке, когда запрос не дошёл до сервера.
+document.addEventListener('DOMContentLoaded', function () {
+  var form = document.querySelector('[data-comment-form]');
+  if (!form || !window.fetch || !window.FormData) {
+    return;
+  }
+  var errors = form.querySelector('[data-comment-errors]');
+  var button = form.querySelector('[type=submit]');
+  var FAILED = 'Не удалось отправить комментарий, попробуйте ещё раз.';
+
+  function showErrors(messages) {
+    errors.textContent = messages.join(' ');
+    errors.classList.toggle('d-block', messages.length > 0);
+  }
+
+  function handle(response) {
+    if (response.redirected) {
+      window.location.assign(response.url);
+      return;
+    }
+    if (response.ok) {
+      return response.text().then(function (html) {
+        document.getElementById('comments')
+          .insertAdjacentHTML('afterbegin', html);
+        form.reset();
+        showErrors([]);
+      });
+    }
+    if (response.status === 400) {
+      return response.json().then(function (data) {
+        var messages = [];
+        Object.keys(data.errors).forEach(function (field) {
+          data.errors[field].forEach(function (error) {
+            messages.push(error.message);
+          });
+        });
+        showErrors(messages);
+      });
+    }
+    if (response.status === 429) {
+      var wait = response.headers.get('Retry-After');
+      showErrors(['Слишком много комментариев подряд.' +
+        (wait ? ' Попробуйте через ' + wait + ' с.' : ' Попробуйте позже.')]);
+      return;
+    }
+    showErrors([FAILED]);
+  }
+
+  form.addEventListener('submit', function (event) {
+    event.preventDefault();
+    button.disabled = true;
+    fetch(form.action, {
+      method: 'POST',
+      body: new FormData(form),
+      credentials: 'same-origin',
+      headers: {'X-Requested-With': 'XMLHttpRequest'}
+    }).then(handle, function () {
+      form.submit();
+    }).catch(function () {
+      showErrors([FAILED]);
+    }).then(function () {
+      button.disabled = false;
+    });
+  });
+});
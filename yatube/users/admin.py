@@ -0,0 +1,44 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+
+from .models import AccountPurge
+from .purge import schedule
+
+User = get_user_model()
+
+
+def purge_accounts(modeladmin, request, queryset):
+    scheduled = schedule(queryset.exclude(pk=request.user.pk))
+    modeladmin.message_user(
+        request,
+        f'Деактивировано и поставлено в очередь на удаление: {scheduled}. '
+        'Удаляет их команда purge_accounts.')
+
+
+purge_accounts.short_description = (
+    'Деактивировать и удалить вместе с содержимым')
+
+
+class PurgingUserAdmin(UserAdmin):
+    actions = (purge_accounts,)
+
+    def get_actions(self, request):
+        # штатное удаление держит блокировку базы на всё время каскада
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+
+class AccountPurgeAdmin(admin.ModelAdmin):
+    list_display = ('username', 'status', 'posts', 'comments', 'follows',
+                    'files', 'requested', 'finished')
+    list_filter = ('status',)
+    search_fields = ('username',)
+    readonly_fields = ('user', 'username', 'status', 'posts', 'comments',
+                       'follows', 'files', 'error', 'requested', 'finished')
+
+
+admin.site.unregister(User)
+admin.site.register(User, PurgingUserAdmin)
+admin.site.register(AccountPurge, AccountPurgeAdmin)
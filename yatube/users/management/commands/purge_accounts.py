@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError
+
+from users.models import AccountPurge
+from users.purge import pending, purge_account
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет аккаунты из очереди AccountPurge вместе с постами, '
+        'комментариями, подписками и картинками, пачками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.ACCOUNT_PURGE_CHUNK,
+            help='Сколько строк удалять за транзакцию.',
+        )
+        parser.add_argument(
+            '--pause', type=float, default=settings.ACCOUNT_PURGE_PAUSE,
+            help='Пауза между пачками в секундах, чтобы пропустить '
+                 'другие записи в базу.',
+        )
+
+    def report(self, purge, field, deleted):
+        self.stdout.write(f'{purge.username}: {field} -{deleted}')
+
+    def handle(self, *args, chunk_size, pause, **options):
+        for purge in pending():
+            self.stdout.write(f'Удаляется {purge.username}')
+            try:
+                purge_account(purge, chunk_size, pause, self.report)
+            except DatabaseError as error:
+                AccountPurge.objects.filter(pk=purge.pk).update(
+                    status=AccountPurge.FAILED, error=str(error))
+                self.stderr.write(f'{purge.username}: {error}')
+                continue
+            purge.refresh_from_db()
+            self.stdout.write(
+                f'Удалён {purge.username}: постов {purge.posts}, '
+                f'комментариев {purge.comments}, подписок {purge.follows}, '
+                f'файлов {purge.files}')
@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountPurge',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=150, verbose_name='Имя')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Удаляется'), ('done', 'Удалён'), ('failed', 'Ошибка')], db_index=True, default='pending', max_length=10, verbose_name='Состояние')),
+                ('posts', models.PositiveIntegerField(default=0, verbose_name='Постов')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='Комментариев')),
+                ('follows', models.PositiveIntegerField(default=0, verbose_name='Подписок')),
+                ('files', models.PositiveIntegerField(default=0, verbose_name='Файлов')),
+                ('error', models.TextField(blank=True, verbose_name='Ошибка')),
+                ('requested', models.DateTimeField(auto_now_add=True, verbose_name='Запрошено')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Завершено')),
+                ('user', models.OneToOneField(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='purge', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Удаление аккаунта',
+                'verbose_name_plural': 'Удаления аккаунтов',
+                'ordering': ('-requested',),
+            },
+        ),
+    ]
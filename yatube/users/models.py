@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+class AccountPurge(models.Model):
+    """Отложенное удаление аккаунта со всем содержимым, см. users/purge.py.
+
+    Пользователь удаляется последним, поэтому запись хранит его имя
+    отдельно, а ссылка на него после удаления становится пустой.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Удаляется'),
+        (DONE, 'Удалён'),
+        (FAILED, 'Ошибка'),
+    )
+
+    user = models.OneToOneField(
+        User,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='purge',
+        verbose_name="Пользователь",
+    )
+    username = models.CharField(max_length=150, verbose_name="Имя")
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=PENDING,
+        db_index=True,
+        verbose_name="Состояние",
+    )
+    posts = models.PositiveIntegerField(default=0, verbose_name="Постов")
+    comments = models.PositiveIntegerField(
+        default=0, verbose_name="Комментариев")
+    follows = models.PositiveIntegerField(default=0, verbose_name="Подписок")
+    files = models.PositiveIntegerField(default=0, verbose_name="Файлов")
+    error = models.TextField(blank=True, verbose_name="Ошибка")
+    requested = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Запрошено"
+    )
+    finished = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Завершено"
+    )
+
+    class Meta:
+        ordering = ('-requested',)
+        verbose_name = "Удаление аккаунта"
+        verbose_name_plural = "Удаления аккаунтов"
+
+    def __str__(self) -> str:
+        return f'{self.username}: {self.get_status_display()}'
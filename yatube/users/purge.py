@@ -0,0 +1,99 @@
+"""Удаление аккаунтов с большим количеством постов и комментариев.
+
+Штатное удаление пользователя собирает все каскады в памяти и удаляет
+их одной транзакцией, надолго блокируя SQLite. Здесь аккаунт сначала
+деактивируется (``schedule``), а потом команда ``purge_accounts``
+удаляет подписки, комментарии, посты и их картинки пачками по
+``chunk_size`` строк - каждая пачка в своей транзакции, с паузой между
+ними. Прогресс пишется в ``AccountPurge``. Прерванное удаление можно
+просто запустить снова: каждая пачка удаляет то, что ещё осталось.
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from sorl.thumbnail import delete as delete_image
+
+from posts.models import (
+    ArchivedComment, ArchivedPost, Comment, Follow, Post,
+)
+
+from .models import AccountPurge
+
+User = get_user_model()
+
+
+def schedule(users):
+    """Деактивирует пользователей и ставит их в очередь на удаление."""
+    scheduled = 0
+    for user in users:
+        user.is_active = False
+        # save, а не update: сигнал сбрасывает пользователя в кэше
+        user.save(update_fields=['is_active'])
+        _, created = AccountPurge.objects.get_or_create(
+            user=user, defaults={'username': user.username})
+        scheduled += created
+    return scheduled
+
+
+def steps(user_id):
+    """Что удалять: (счётчик AccountPurge, queryset, поле картинки)."""
+    return (
+        ('follows', Follow.objects.filter(
+            Q(user_id=user_id) | Q(author_id=user_id)), None),
+        ('comments', Comment.objects.filter(
+            Q(author_id=user_id) | Q(post__author_id=user_id)), None),
+        ('comments', ArchivedComment.objects.filter(
+            Q(author_id=user_id) | Q(post__author_id=user_id)), None),
+        ('posts', Post.objects.filter(author_id=user_id), 'image'),
+        ('posts', ArchivedPost.objects.filter(author_id=user_id), 'image'),
+    )
+
+
+def delete_in_chunks(queryset, chunk_size, image_field=None):
+    """Удаляет queryset пачками, для каждой отдаёт (строк, картинки)."""
+    model = queryset.model
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.values_list('pk', flat=True)[:chunk_size])
+            if not ids:
+                return
+            chunk = model.objects.filter(pk__in=ids)
+            images = []
+            if image_field:
+                images = [name for name in chunk.values_list(
+                    image_field, flat=True) if name]
+            chunk.delete()
+        yield len(ids), images
+
+
+def purge_account(purge, chunk_size=500, pause=0, report=None):
+    """Удаляет содержимое аккаунта пачками, затем сам аккаунт."""
+    AccountPurge.objects.filter(pk=purge.pk).update(
+        status=AccountPurge.RUNNING)
+    user_id = purge.user_id
+    for field, queryset, image_field in steps(user_id):
+        for deleted, images in delete_in_chunks(
+                queryset, chunk_size, image_field):
+            # файлы - только после коммита пачки
+            for name in images:
+                delete_image(name)
+            AccountPurge.objects.filter(pk=purge.pk).update(**{
+                field: F(field) + deleted,
+                'files': F('files') + len(images),
+            })
+            if report:
+                report(purge, field, deleted)
+            time.sleep(pause)
+    User.objects.filter(pk=user_id).delete()
+    AccountPurge.objects.filter(pk=purge.pk).update(
+        status=AccountPurge.DONE, finished=timezone.now())
+
+
+def pending():
+    return AccountPurge.objects.filter(
+        status__in=(AccountPurge.PENDING, AccountPurge.RUNNING),
+        user__isnull=False,
+    ).order_by('requested')
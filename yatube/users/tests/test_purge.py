@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, GroupStats, Post
+
+from ..models import AccountPurge
+from ..purge import schedule
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+User = get_user_model()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x01\x00'
+    b'\x01\x00\x00\x00\x00\x21\xf9\x04'
+    b'\x01\x0a\x00\x01\x00\x2c\x00\x00'
+    b'\x00\x00\x01\x00\x01\x00\x00\x02'
+    b'\x02\x4c\x01\x00\x3b'
+)
+
+
+@override_settings(ACCOUNT_PURGE_PAUSE=0, MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PurgeTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin')
+        cls.spammer = User.objects.create_user(
+            username='spammer', password='spam')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание')
+        cls.own_post = Post.objects.create(
+            author=cls.reader, text='Чистый пост', group=cls.group)
+        for number in range(5):
+            post = Post.objects.create(
+                author=cls.spammer, text=f'Спам {number}', group=cls.group)
+            Comment.objects.create(
+                post=post, author=cls.reader, text='Ответ на спам')
+        Comment.objects.create(
+            post=cls.own_post, author=cls.spammer, text='Спам в комментах')
+        Follow.objects.create(user=cls.reader, author=cls.spammer)
+        Follow.objects.create(user=cls.spammer, author=cls.reader)
+
+    def test_admin_action_deactivates(self):
+        """Действие админки деактивирует аккаунт и ставит его в очередь."""
+        client = Client()
+        client.force_login(self.admin)
+        client.post(reverse('admin:auth_user_changelist'), {
+            'action': 'purge_accounts',
+            '_selected_action': [self.spammer.pk, self.admin.pk],
+        })
+        self.spammer.refresh_from_db()
+        self.admin.refresh_from_db()
+        self.assertFalse(self.spammer.is_active)
+        self.assertTrue(self.admin.is_active)
+        self.assertEqual(
+            AccountPurge.objects.get().status, AccountPurge.PENDING)
+
+    def test_deactivated_user_logged_out(self):
+        """Деактивированный пользователь теряет вход сразу."""
+        client = Client()
+        client.force_login(self.spammer)
+        client.get(reverse('posts:post_create'))
+        schedule([self.spammer])
+        response = client.get(reverse('posts:post_create'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_purge_in_chunks(self):
+        """Команда удаляет всё содержимое пачками и пишет прогресс."""
+        schedule([self.spammer])
+        out = StringIO()
+        call_command('purge_accounts', '--chunk-size', '2', stdout=out)
+        purge = AccountPurge.objects.get()
+        self.assertEqual(purge.status, AccountPurge.DONE)
+        self.assertEqual(
+            (purge.posts, purge.comments, purge.follows), (5, 6, 2))
+        self.assertFalse(User.objects.filter(username='spammer').exists())
+        self.assertEqual(list(Post.objects.all()), [self.own_post])
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group).posts_count, 1)
+        self.assertEqual(out.getvalue().count('spammer: posts -'), 3)
+
+    def test_purge_deletes_images(self):
+        """Картинки постов удаляются вместе с постами."""
+        post = Post.objects.create(
+            author=self.spammer, text='С картинкой',
+            image=SimpleUploadedFile('spam.gif', SMALL_GIF, 'image/gif'))
+        path = post.image.path
+        self.assertTrue(os.path.exists(path))
+        schedule([self.spammer])
+        call_command('purge_accounts', stdout=StringIO())
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(AccountPurge.objects.get().files, 1)
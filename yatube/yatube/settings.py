@@ -46,44 +46,90 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'sorl.thumbnail',
-    'debug_toolbar',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.SlowQueryLogMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.CachedAuthenticationMiddleware',
+    'core.middleware.SessionActivityMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+if DEBUG:
+    INSTALLED_APPS += ['debug_toolbar']
+    MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
+
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
 
+# сессии в кэше с отложенной записью отметок активности, см.
+# core/sessions.py; пользователь запроса тоже из кэша, см. core/auth.py.
+# Только при общем кэше, см. CACHE_SINGLE_PROCESS
+SESSION_ENGINE = 'core.sessions'
+SESSION_LAZY_KEYS = ['last_activity']
+SESSION_LAZY_WRITE_INTERVAL = 60 * 5
+SESSION_ACTIVITY_RESOLUTION = 60
+AUTH_USER_CACHE_TIMEOUT = 60 * 15
+
+# адреса, которым доступен /metrics
+METRICS_ALLOWED_IPS = INTERNAL_IPS
+
 ROOT_URLCONF = 'yatube.urls'
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATES_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if not DEBUG:
+    # шаблоны разбираются один раз на процесс, а не на каждый запрос
+    TEMPLATES_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATES_LOADERS),
+    ]
+# debug_toolbar проверяет только APP_DIRS, а он несовместим с явными
+# loaders; app_directories.Loader в TEMPLATES_LOADERS есть, шаблоны
+# панели находятся
+SILENCED_SYSTEM_CHECKS = ['debug_toolbar.W006']
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATES_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.unread.unread',
             ],
         },
     },
 ]
 
+# горячие шаблоны ленты на Jinja2 (каталог jinja2/), остальные страницы
+# по-прежнему рисует Django; включается переменной окружения
+JINJA2_ENABLED = os.getenv('YATUBE_JINJA2', '') == '1'
+JINJA2_TEMPLATES = {
+    'BACKEND': 'django.template.backends.jinja2.Jinja2',
+    'DIRS': [os.path.join(BASE_DIR, 'jinja2')],
+    'OPTIONS': {
+        'environment': 'core.jinja2.environment',
+        'context_processors': TEMPLATES[0]['OPTIONS']['context_processors'],
+    },
+}
+if JINJA2_ENABLED:
+    TEMPLATES.insert(0, JINJA2_TEMPLATES)
+
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
 
@@ -92,11 +138,35 @@ WSGI_APPLICATION = 'yatube.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    },
+    # копия default, обновляется командой refresh_replicas
+    'replica': {
+        'ENGINE': 'core.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db_replica.sqlite3'),
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+# алиасы реплик для чтения лент; пустой список - всё читается из default
+DATABASE_REPLICAS = []
+REPLICA_READ_VIEWS = [
+    'posts:index',
+    'posts:group_post',
+    'posts:profile',
+    'posts:post_detail',
+    'posts:follow_index',
+]
+# после записи клиент столько секунд читает только из default
+REPLICA_PIN_SECONDS = 30
+REPLICA_PIN_COOKIE = 'use_primary'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
@@ -136,6 +206,13 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+if not DEBUG:
+    # collectstatic: хэши в именах, минификация и .gz/.br варианты
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# отдавать статику из Django (core/static.py), если перед ним нет
+# фронт-сервера; runserver в DEBUG отдаёт её сам
+STATIC_SERVE = True
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
@@ -143,11 +220,139 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# отдача медиа, см. core/media.py: None - сам Django, 'x-accel-redirect'
+# (nginx, internal location по MEDIA_ACCEL_PREFIX) или 'x-sendfile'
+MEDIA_ACCEL = None
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_PUBLIC_PREFIXES = ['posts/', 'cache/']
+MEDIA_MAX_AGE = 60 * 60 * 24
 
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+        'BACKEND': 'core.cache.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # рекомендации авторов, см. posts/follow_graph.py; живут сутки (build_suggestions запускается чаще), отдельно от
+    # кэша по умолчанию, чтобы их не вытесняли соседи
+    'follow_graph': {
+        'BACKEND': 'core.cache.LocMemCache',
+        'LOCATION': 'follow-graph',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {'MAX_ENTRIES': 1000000},
+    },
 }
 
+# LocMem виден только своему процессу; True - сайт работает в одном
+# процессе (runserver), и на LocMem можно держать сессии и пользователя
+# запроса. При нескольких воркерах нужен общий кэш (memcached, redis),
+# иначе они читаются из базы, см. core/cache.py
+CACHE_SINGLE_PROCESS = DEBUG
+
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
+
+# сколько хранится отрисованная карточка поста, см. posts/cards.py
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# ленты: кэш числа постов, порог точного подсчёта и глубина листания,
+# см. posts/paginator.py
+FEED_COUNT_TIMEOUT = 60 * 5
+FEED_EXACT_COUNT_LIMIT = 10000
+FEED_MAX_PAGES = 100
+
+# рекомендации авторов: сколько хранить на пользователя и сколько
+# показывать в виджете
+FOLLOW_GRAPH_CACHE = 'follow_graph'
+SUGGESTIONS_TOP = 20
+SUGGESTIONS_SHOWN = 5
+
+# лента популярного, см. posts/trending.py: период полураспада рейтинга
+# в секундах, веса событий, порог удаления затухших рейтингов командой
+# compact_trending и окно её пересчёта с --rebuild
+TRENDING_HALF_LIFE = 60 * 60 * 6
+TRENDING_POST_WEIGHT = 1.0
+TRENDING_COMMENT_WEIGHT = 1.0
+TRENDING_MIN_SCORE = 0.01
+TRENDING_REBUILD_DAYS = 7
+
+# каталог групп, см. posts/group_stats.py: окно «постов за неделю»
+# в днях и время жизни кэша каталога в секундах
+GROUP_RECENT_DAYS = 7
+GROUP_DIRECTORY_TIMEOUT = 60 * 10
+
+# просмотры постов копятся в памяти воркера и пишутся в базу пачкой
+# после стольких просмотров или раз в столько секунд (у простаивающего
+# воркера - по таймеру), см. posts/view_counter.py
+POST_VIEWS_FLUSH_SIZE = 500
+POST_VIEWS_FLUSH_INTERVAL = 10
+
+# непрочитанное в ленте подписок, см. posts/unread.py: предел счётчика
+# и время его жизни в кэше: в общем и в LocMem, где счётчик увеличивает
+# только воркер, сохранивший пост
+UNREAD_MAX = 99
+UNREAD_TIMEOUT = 60 * 10
+UNREAD_LOCAL_TIMEOUT = 5
+
+# опрос лент на новые посты, см. posts/polling.py: сколько секунд
+# максимум держать long polling (он занимает поток воркера), как часто
+# проверять отметку ленты и сколько её хранить в кэше: в общем и в
+# LocMem, где отметку сдвигает только воркер, сохранивший пост
+POLL_MAX_WAIT = 25
+POLL_CHECK_INTERVAL = 1
+POLL_MARK_TIMEOUT = 60 * 60 * 24
+POLL_MARK_LOCAL_TIMEOUT = 5
+
+# сколько имён принимает массовая подписка за запрос
+FOLLOW_BULK_LIMIT = 500
+
+# ограничение частоты запросов, см. core/ratelimit.py:
+# (запросов, за сколько секунд) на пользователя и на IP
+RATELIMIT_ENABLED = True
+RATELIMIT_CACHE = 'default'
+RATELIMITS = {
+    'post_create': {'user': (10, 60), 'ip': (60, 60)},
+    'add_comment': {'user': (20, 60), 'ip': (120, 60)},
+    'follow': {'user': (60, 60), 'ip': (300, 60)},
+}
+
+# удаление аккаунтов командой purge_accounts, см. users/purge.py:
+# строк в транзакции и пауза между пачками в секундах
+ACCOUNT_PURGE_CHUNK = 500
+ACCOUNT_PURGE_PAUSE = 0.05
+
+# поиск похожих постов, см. posts/minhash.py: с какого сходства
+# Жаккара пост считается копией, сколько слов и пар слов нужно тексту
+# для отпечатка и сколько кандидатов из индекса проверять
+MINHASH_MIN_SIMILARITY = 0.7
+MINHASH_MIN_FEATURES = 8
+MINHASH_MAX_CANDIDATES = 200
+
+# посты старше стольких дней переносит в архив команда archive_posts
+POST_ARCHIVE_AFTER_DAYS = 365
+
+# запросы дольше порога пишутся в SLOW_QUERY_LOG,
+# сводка - manage.py slow_query_report
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_LOG = os.path.join(BASE_DIR, 'slow_queries.log')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'raw': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.FileHandler',
+            'filename': SLOW_QUERY_LOG,
+            'delay': True,
+            'formatter': 'raw',
+        },
+    },
+    'loggers': {
+        'yatube.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
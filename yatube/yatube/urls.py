@@ -14,9 +14,11 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from core import media, static as static_files
+from core.views import metrics
 
 
 urlpatterns = [
@@ -24,15 +26,21 @@ urlpatterns = [
     path('auth/', include('users.urls', namespace='auth')),
     path('auth/', include('django.contrib.auth.urls')),
     path('about/', include('about.urls', namespace='about')),
+    path('metrics', metrics, name='metrics'),
+    re_path(
+        r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'),
+        media.serve, name='media'),
     path('', include('posts.url', namespace='posts')),
 ]
 
+if settings.STATIC_SERVE:
+    urlpatterns.append(re_path(
+        r'^%s(?P<path>.+)$' % settings.STATIC_URL.lstrip('/'),
+        static_files.serve, name='static'))
+
 if settings.DEBUG:
     import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-    )
 
 handler404 = 'core.views.page_not_found'
 handler403 = 'core.views.permission_denied'